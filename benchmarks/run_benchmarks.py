@@ -0,0 +1,576 @@
+# benchmarks/run_benchmarks.py
+"""
+Benchmark dos endpoints da API.
+
+Para cada escala (quantidade de tarefas), cria um banco SQLite populado com
+usuários, tarefas e compartilhamentos, executa todas as rotas de usuários e
+tarefas dentro do processo (via ASGI, sem servidor HTTP) e registra as
+latências p50/p95/p99 e a vazão de cada rota em um arquivo JSON.
+
+Uso:
+    python benchmarks/run_benchmarks.py --scales 1000,100000 --requests 200
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+import httpx  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from auth import (  # noqa: E402
+    create_access_token,
+    create_refresh_token,
+    token_claims,
+    user_cache,
+)
+from database import (  # noqa: E402
+    Task,
+    User,
+    create_database_engine,
+    migrate,
+    task_shares,
+)
+from main import create_app  # noqa: E402
+from passwords import hash_password  # noqa: E402
+from routers.task import task_list_cache  # noqa: E402
+from settings import settings  # noqa: E402
+
+# Bancos de cada escala, em um diretório temporário (o banco local não é usado)
+WORK_DIR = Path(tempfile.mkdtemp(prefix="tasks-bench-"))
+
+BENCH_PASSWORD = "SenhaBenchmark123"
+TASKS_PER_USER = 100
+SEED_CHUNK_SIZE = 50_000
+# Uma a cada SHARE_EVERY tarefas é compartilhada com outro usuário
+SHARE_EVERY = 10
+# Itens por requisição nos endpoints em lote e na importação
+BATCH_SIZE = 10
+WORDS = ("Relatório", "Reunião", "Compras", "Academia", "Projeto", "Viagem")
+
+
+@dataclass
+class Scenario:
+    """
+    Rota medida: `build(i, context, targets)` retorna o caminho e os
+    argumentos da i-ésima requisição (os cabeçalhos, se informados,
+    substituem os do usuário do benchmark). `targets` tarefas pendentes do usuário
+    do benchmark são criadas antes da medição para as rotas que as alteram.
+    Com `cached=False`, o cache da listagem é esvaziado antes de cada
+    requisição (fora da medição), para que a rota consulte o banco.
+    """
+
+    name: str
+    method: str
+    build: Callable
+    targets: int = 0
+    password: bool = False
+    cached: bool = True
+
+
+def take(targets: list, i: int, size: int = 1) -> list:
+    return targets[i * size : (i + 1) * size]
+
+
+SCENARIOS = [
+    Scenario(
+        "POST /users/",
+        "POST",
+        lambda i, ctx, _: (
+            "/users/",
+            {
+                "json": {
+                    "name": "Novo Usuário",
+                    "email": f"novo-{ctx['run']}-{i}@exemplo.com",
+                    "password": BENCH_PASSWORD,
+                }
+            },
+        ),
+        password=True,
+    ),
+    Scenario(
+        "POST /users/login",
+        "POST",
+        lambda i, ctx, _: (
+            "/users/login",
+            {"data": {"username": ctx["email"], "password": BENCH_PASSWORD}},
+        ),
+        password=True,
+    ),
+    Scenario(
+        "POST /users/refresh",
+        "POST",
+        lambda i, ctx, _: (
+            "/users/refresh",
+            {"json": {"refresh_token": ctx["refresh_tokens"][i]}},
+        ),
+    ),
+    Scenario(
+        "POST /users/logout",
+        "POST",
+        lambda i, ctx, _: (
+            "/users/logout",
+            {
+                "headers": {"Authorization": f"Bearer {ctx['sessions'][i][0]}"},
+                "json": {"refresh_token": ctx["sessions"][i][1]},
+            },
+        ),
+    ),
+    Scenario("GET /tasks/", "GET", lambda i, ctx, _: ("/tasks/", {}), cached=False),
+    Scenario(
+        "GET /tasks/?limit=100",
+        "GET",
+        lambda i, ctx, _: ("/tasks/", {"params": {"limit": 100}}),
+        cached=False,
+    ),
+    Scenario(
+        "GET /tasks/?limit=100&sort_by=title",
+        "GET",
+        lambda i, ctx, _: ("/tasks/", {"params": {"limit": 100, "sort_by": "title"}}),
+        cached=False,
+    ),
+    Scenario(
+        "GET /tasks/?fields=id,title,is_completed",
+        "GET",
+        lambda i, ctx, _: ("/tasks/", {"params": {"fields": "id,title,is_completed"}}),
+        cached=False,
+    ),
+    Scenario(
+        "GET /tasks/summary",
+        "GET",
+        lambda i, ctx, _: ("/tasks/summary", {}),
+        cached=False,
+    ),
+    # As mesmas listagens servidas do cache (após a primeira requisição)
+    Scenario("GET /tasks/ (cache)", "GET", lambda i, ctx, _: ("/tasks/", {})),
+    Scenario(
+        "GET /tasks/summary (cache)", "GET", lambda i, ctx, _: ("/tasks/summary", {})
+    ),
+    Scenario(
+        "GET /tasks/search",
+        "GET",
+        lambda i, ctx, _: (
+            "/tasks/search",
+            {"params": {"q": WORDS[i % len(WORDS)][:4]}},
+        ),
+    ),
+    Scenario("GET /tasks/export", "GET", lambda i, ctx, _: ("/tasks/export", {})),
+    Scenario(
+        "POST /tasks/",
+        "POST",
+        lambda i, ctx, _: (
+            "/tasks/",
+            {"json": {"title": f"Criada {ctx['run']}-{i}", "description": "Nova"}},
+        ),
+    ),
+    Scenario(
+        "POST /tasks/batch",
+        "POST",
+        lambda i, ctx, _: (
+            "/tasks/batch",
+            {
+                "json": {
+                    "tasks": [
+                        {"title": f"Lote {ctx['run']}-{i}-{n}"}
+                        for n in range(BATCH_SIZE)
+                    ]
+                }
+            },
+        ),
+    ),
+    Scenario(
+        "PATCH /tasks/batch/complete",
+        "PATCH",
+        lambda i, ctx, targets: (
+            "/tasks/batch/complete",
+            {"json": {"ids": take(targets, i, BATCH_SIZE)}},
+        ),
+        targets=BATCH_SIZE,
+    ),
+    Scenario(
+        "POST /tasks/batch/delete",
+        "POST",
+        lambda i, ctx, targets: (
+            "/tasks/batch/delete",
+            {"json": {"ids": take(targets, i, BATCH_SIZE)}},
+        ),
+        targets=BATCH_SIZE,
+    ),
+    Scenario(
+        "PUT /tasks/{task_id}",
+        "PUT",
+        lambda i, ctx, targets: (
+            f"/tasks/{targets[i]}",
+            {"json": {"title": f"Editada {ctx['run']}-{i}"}},
+        ),
+        targets=1,
+    ),
+    Scenario(
+        "PATCH /tasks/{task_id}/complete",
+        "PATCH",
+        lambda i, ctx, targets: (f"/tasks/{targets[i]}/complete", {}),
+        targets=1,
+    ),
+    Scenario(
+        "DELETE /tasks/{task_id}",
+        "DELETE",
+        lambda i, ctx, targets: (f"/tasks/{targets[i]}", {}),
+        targets=1,
+    ),
+    Scenario(
+        "POST /tasks/import",
+        "POST",
+        lambda i, ctx, _: (
+            "/tasks/import",
+            {
+                "files": {
+                    "file": (
+                        "tarefas.ndjson",
+                        "\n".join(
+                            json.dumps({"title": f"Importada {ctx['run']}-{i}-{n}"})
+                            for n in range(BATCH_SIZE)
+                        ),
+                        "application/x-ndjson",
+                    )
+                }
+            },
+        ),
+    ),
+    Scenario(
+        "POST /tasks/{task_id}/share",
+        "POST",
+        lambda i, ctx, targets: (
+            f"/tasks/{targets[i]}/share",
+            {"json": {"user_email": ctx["friends"][0]}},
+        ),
+        targets=1,
+    ),
+    Scenario(
+        "POST /tasks/{task_id}/share/batch",
+        "POST",
+        lambda i, ctx, targets: (
+            f"/tasks/{targets[i]}/share/batch",
+            {"json": {"user_emails": ctx["friends"]}},
+        ),
+        targets=1,
+    ),
+    # Por último e com um usuário próprio por requisição: invalida todos os
+    # tokens do usuário, que não podem ser os dos demais cenários
+    Scenario(
+        "POST /users/logout/all",
+        "POST",
+        lambda i, ctx, _: (
+            "/users/logout/all",
+            {"headers": {"Authorization": f"Bearer {ctx['logout_all_tokens'][i]}"}},
+        ),
+    ),
+]
+
+
+def user_email(user_id: int) -> str:
+    return f"usuario{user_id}@exemplo.com"
+
+
+def count_users(task_count: int) -> int:
+    return max(2, task_count // TASKS_PER_USER)
+
+
+def seed_database(engine, task_count: int) -> None:
+    """
+    Popula o banco com `task_count` tarefas, TASKS_PER_USER por usuário,
+    e compartilha uma a cada SHARE_EVERY tarefas com o usuário seguinte.
+    """
+    migrate(engine)
+
+    user_count = count_users(task_count)
+    password = hash_password(BENCH_PASSWORD)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(User),
+            [
+                {
+                    "id": n,
+                    "name": f"Usuário {n}",
+                    "email": user_email(n),
+                    "password": password,
+                }
+                for n in range(1, user_count + 1)
+            ],
+        )
+
+    for start in range(0, task_count, SEED_CHUNK_SIZE):
+        numbers = range(start, min(start + SEED_CHUNK_SIZE, task_count))
+        tasks, shares = [], []
+        for n in numbers:
+            owner_id = n % user_count + 1
+            tasks.append(
+                {
+                    "id": n + 1,
+                    "title": f"{WORDS[n % len(WORDS)]} {n}",
+                    "description": f"Descrição da tarefa {n} sobre {WORDS[(n // 7) % len(WORDS)].lower()}",
+                    "is_completed": n % 3 == 0,
+                    "owner_id": owner_id,
+                }
+            )
+            if n % SHARE_EVERY == 0:
+                shares.append({"task_id": n + 1, "user_id": owner_id % user_count + 1})
+        with engine.begin() as connection:
+            connection.execute(insert(Task), tasks)
+            if shares:
+                connection.execute(insert(task_shares), shares)
+
+
+def create_targets(engine, user_id: int, prefix: str, count: int) -> list:
+    """
+    Cria tarefas pendentes do usuário para as rotas que alteram tarefas.
+    """
+    with engine.begin() as connection:
+        result = connection.execute(
+            insert(Task).returning(Task.id),
+            [
+                {"title": f"{prefix} {n}", "owner_id": user_id, "is_completed": False}
+                for n in range(count)
+            ],
+        )
+        return [row.id for row in result]
+
+
+def create_users(engine, prefix: str, count: int) -> list:
+    """
+    Cria usuários próprios para as rotas que invalidam os tokens do usuário.
+    """
+    with engine.begin() as connection:
+        result = connection.execute(
+            insert(User).returning(User.id, User.email),
+            [
+                {
+                    "name": f"{prefix} {n}",
+                    "email": f"{prefix.lower()}-{n}@exemplo.com",
+                    "password": "-",
+                }
+                for n in range(count)
+            ],
+        )
+        return [User(id=row.id, email=row.email, security_stamp=0) for row in result]
+
+
+def percentile(quantiles: list, value: int) -> float:
+    return round(quantiles[value - 1] * 1000, 3)
+
+
+async def measure(client, scenario, context, targets, requests, concurrency) -> dict:
+    """
+    Executa as requisições do cenário com `concurrency` clientes simultâneos
+    e resume as latências e a vazão.
+    """
+    latencies, errors = [], 0
+    pending = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in pending:
+            path, kwargs = scenario.build(i, context, targets)
+            kwargs.setdefault("headers", context["headers"])
+            if not scenario.cached:
+                task_list_cache.clear()
+            started = time.perf_counter()
+            response = await client.request(scenario.method, path, **kwargs)
+            await response.aread()
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "route": scenario.name,
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": percentile(quantiles, 50),
+        "p95_ms": percentile(quantiles, 95),
+        "p99_ms": percentile(quantiles, 99),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+    }
+
+
+async def run_scale(task_count: int, args) -> list:
+    """
+    Cria e popula o banco da escala e mede todas as rotas sobre ele.
+    """
+    database_path = WORK_DIR / f"tasks-{task_count}.db"
+    database_url = f"sqlite:///{database_path}"
+    engine = create_database_engine(database_url, settings)
+    started = time.perf_counter()
+    seed_database(engine, task_count)
+    print(
+        f"[{task_count} tarefas] banco populado em {time.perf_counter() - started:.1f}s"
+    )
+
+    # Os IDs se repetem entre os bancos de cada escala
+    user_cache.clear()
+    task_list_cache.clear()
+    app = create_app(settings.model_copy(update={"database_url": database_url}))
+
+    results = []
+    # O ASGITransport não executa o lifespan, que cria o engine da aplicação
+    transport = httpx.ASGITransport(app=app)
+    async with (
+        app.router.lifespan_context(app),
+        httpx.AsyncClient(transport=transport, base_url="http://bench") as client,
+    ):
+        bench_user = User(id=1, email=user_email(1), security_stamp=0)
+        login = await client.post(
+            "/users/login", data={"username": user_email(1), "password": BENCH_PASSWORD}
+        )
+        context = {
+            "run": task_count,
+            "email": user_email(1),
+            # Destinatários dos compartilhamentos (até 5 outros usuários)
+            "friends": [
+                user_email(n) for n in range(2, min(6, count_users(task_count)) + 1)
+            ],
+            "headers": {"Authorization": f"Bearer {login.json()['access_token']}"},
+            # Cada refresh token vale para uma única renovação
+            "refresh_tokens": [
+                create_refresh_token(bench_user) for _ in range(args.requests)
+            ],
+            # Cada logout revoga o próprio par (token de acesso, refresh token)
+            "sessions": [
+                (
+                    create_access_token(data=token_claims(bench_user)),
+                    create_refresh_token(bench_user),
+                )
+                for _ in range(args.requests)
+            ],
+            # Cada logout/all encerra as sessões de um usuário diferente
+            "logout_all_tokens": [
+                create_access_token(data=token_claims(user))
+                for user in create_users(engine, "Sessões", args.requests)
+            ],
+        }
+        for scenario in SCENARIOS:
+            requests = args.password_requests if scenario.password else args.requests
+            targets = (
+                create_targets(engine, 1, scenario.name, requests * scenario.targets)
+                if scenario.targets
+                else []
+            )
+            result = await measure(
+                client, scenario, context, targets, requests, args.concurrency
+            )
+            result["scale"] = task_count
+            results.append(result)
+            print(
+                f"  {result['route']:<42} p50={result['p50_ms']:>9.2f}ms "
+                f"p95={result['p95_ms']:>9.2f}ms p99={result['p99_ms']:>9.2f}ms "
+                f"{result['throughput_rps']:>9.1f} req/s"
+                + (f" ({result['errors']} erros)" if result["errors"] else "")
+            )
+
+    engine.dispose()
+    if not args.keep_databases:
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{database_path}{suffix}").unlink(missing_ok=True)
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def at_least_two(value: str) -> int:
+    """
+    Quantidade de requisições: os percentis exigem ao menos duas latências.
+    """
+    count = int(value)
+    if count < 2:
+        raise argparse.ArgumentTypeError("deve ser no mínimo 2")
+    return count
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument(
+        "--scales",
+        default="1000",
+        help="Quantidades de tarefas separadas por vírgula (ex.: 1000,100000,1000000)",
+    )
+    parser.add_argument(
+        "--requests", type=at_least_two, default=200, help="Requisições por rota"
+    )
+    parser.add_argument(
+        "--password-requests",
+        type=at_least_two,
+        default=10,
+        help="Requisições nas rotas que executam o bcrypt (cadastro e login)",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=1, help="Clientes simultâneos por rota"
+    )
+    parser.add_argument(
+        "--output",
+        default="bench-results.json",
+        help="Arquivo JSON com os resultados",
+    )
+    parser.add_argument(
+        "--keep-databases",
+        action="store_true",
+        help=f"Mantém os bancos populados em {WORK_DIR}",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    scales = [int(scale) for scale in args.scales.split(",")]
+
+    results = []
+    for task_count in scales:
+        results.extend(asyncio.run(run_scale(task_count, args)))
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "scales": scales,
+            "requests": args.requests,
+            "password_requests": args.password_requests,
+            "concurrency": args.concurrency,
+        },
+        "settings": settings.model_dump(),
+        "results": results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print(f"Resultados gravados em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,78 @@
 # src/auth.py
 
-from passlib.context import CryptContext
+import time
+from uuid import uuid4
 from jose import JWTError, jwt
-from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import event, inspect
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from database import User, get_db
+from cache import TTLCache
+from database import User, get_async_db, get_db
+from passwords import (
+    PasswordExecutor,
+    PasswordPoolSaturated,
+    check_password,
+    hash_password,
+)
+from revocation import RevocationList
+from settings import settings
+from timing import phase
 
 # Configurações de segurança
 SECRET_KEY = "sua-chave-secreta"  # Substitua por uma chave secreta segura
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
+REFRESH_TOKEN_EXPIRE_DAYS = settings.refresh_token_expire_days
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login")
 
+# Cache token -> identidade do usuário, evitando a consulta a cada requisição
+user_cache = TTLCache(maxsize=settings.user_cache_size, ttl=settings.user_cache_ttl)
+
+# Tokens revogados (logout e refresh tokens já usados) e carimbos de segurança
+# alterados, verificados em memória e sincronizados entre os workers
+revoked_tokens = RevocationList(
+    sync_interval=settings.token_revocation_sync_interval,
+    stamp_lifetime=max(
+        timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
+        timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+    ),
+)
+
+# Pool de processos para o bcrypt, liberando as threads da API
+password_executor = PasswordExecutor(
+    workers=settings.password_workers, max_pending=settings.password_max_pending
+)
+
+def run_password_work(func, *args):
+    """
+    Executa o trabalho de senha no pool, respondendo 503 se estiver saturado.
+    """
+    try:
+        with phase("password"):
+            return password_executor.run(func, *args)
+    except PasswordPoolSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servidor ocupado, tente novamente em instantes",
+            headers={"Retry-After": "1"},
+        )
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verifica se a senha fornecida corresponde ao hash armazenado.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return run_password_work(check_password, plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """
     Gera um hash para a senha fornecida.
     """
-    return pwd_context.hash(password)
+    return run_password_work(hash_password, password)
 
 def authenticate_user(email: str, password: str, db: Session) -> User:
     """
@@ -48,27 +94,198 @@ def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid4().hex})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+def token_claims(user: User) -> dict:
     """
-    Recupera o usuário atual a partir do token JWT.
+    Claims de identidade do token do usuário: e-mail, ID e carimbo de segurança.
     """
-    credentials_exception = HTTPException(
+    return {"sub": user.email, "uid": user.id, "ver": user.security_stamp}
+
+def create_refresh_token(user: User) -> str:
+    """
+    Cria o refresh token do usuário, usado uma única vez para obter um novo
+    par de tokens sem repetir o login.
+    """
+    return create_access_token(
+        {**token_claims(user), "typ": "refresh"},
+        expires_delta=timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+    )
+
+def credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Credenciais inválidas",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+class Principal:
+    """
+    Usuário autenticado montado a partir das claims do token, sem consultar
+    o banco. O ID e o e-mail vêm do token; os demais atributos carregam o
+    User sob demanda, conferindo o carimbo de segurança.
+    """
+
+    __slots__ = ("id", "email", "security_stamp", "_db", "_user")
+
+    def __init__(self, id: int, email: str, security_stamp: int, db: Session):
+        self.id = id
+        self.email = email
+        self.security_stamp = security_stamp
+        self._db = db
+        self._user = None
+
+    @property
+    def user(self) -> User:
+        if self._user is None:
+            with phase("user"):
+                user = self._db.get(User, self.id)
+            if user is None or user.security_stamp != self.security_stamp:
+                raise credentials_exception()
+            self._user = user
+        return self._user
+
+    def __getattr__(self, name: str):
+        return getattr(self.user, name)
+
+def decode_token(token: str, db: Session) -> dict:
+    """
+    Valida o token JWT e confere se não foi revogado, retornando suas claims.
+    """
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
+        with phase("jwt"):
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
-        raise credentials_exception
+        raise credentials_exception()
+    if payload.get("sub") is None:
+        raise credentials_exception()
 
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise credentials_exception
+    revoked_tokens.sync(db)
+    if payload.get("jti") in revoked_tokens:
+        raise credentials_exception()
+    return payload
+
+def revoke_token(payload: dict, db: Session) -> None:
+    """
+    Revoga o token até a sua expiração (tokens antigos, sem jti, não são revogáveis).
+    Um token já revogado, inclusive por uma requisição concorrente, resulta em 401.
+    """
+    if payload.get("jti") is None:
+        return
+    expires_at = datetime.fromtimestamp(payload["exp"], timezone.utc).replace(tzinfo=None)
+    token_type = payload.get("typ", "access")
+    if not revoked_tokens.revoke(db, payload["jti"], expires_at, token_type):
+        raise credentials_exception()
+
+def commit_revocations(db: Session) -> None:
+    """
+    Confirma as revogações da sessão. Se outro worker revogou o mesmo token
+    antes (jti já gravado), desfaz a transação e responde 401.
+    """
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise credentials_exception()
+
+def rotate_refresh_token(token: str, db: Session) -> User:
+    """
+    Valida o refresh token e o revoga, retornando o usuário para a emissão
+    de um novo par de tokens.
+    """
+    payload = decode_token(token, db)
+    if payload.get("typ") != "refresh":
+        raise credentials_exception()
+    user = db.get(User, payload.get("uid"))
+    if user is None or user.security_stamp != payload.get("ver"):
+        raise credentials_exception()
+    revoke_token(payload, db)
     return user
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+    """
+    Recupera o usuário atual a partir do token JWT. Tokens com o ID do
+    usuário nas claims resultam em um Principal, sem consulta ao banco.
+    """
+    payload = decode_token(token, db)
+    if payload.get("typ") == "refresh":
+        raise credentials_exception()
+    email: str = payload["sub"]
+
+    # Carimbo alterado (inclusive em outro worker) invalida os tokens anteriores
+    user_id = payload.get("uid")
+    stamp = payload.get("ver")
+    if user_id is not None and not revoked_tokens.accepts_stamp(user_id, stamp or 0):
+        raise credentials_exception()
+    if settings.auth_stateless_tokens and user_id is not None:
+        return Principal(user_id, email, stamp or 0, db)
+
+    identity = user_cache.get(token)
+    if identity is not None:
+        with phase("user"):
+            user = _attach_cached_user(identity, db)
+    else:
+        with phase("user"):
+            user = db.query(User).filter(User.email == email).first()
+        if user is None:
+            raise credentials_exception()
+
+        # A entrada nunca sobrevive ao próprio token
+        user_cache.set(
+            token,
+            {
+                "id": user.id,
+                "name": user.name,
+                "email": user.email,
+                "security_stamp": user.security_stamp,
+            },
+            ttl=payload.get("exp", float("inf")) - time.time(),
+        )
+
+    if stamp is not None and user.security_stamp != stamp:
+        raise credentials_exception()
+    return user
+
+def _attach_cached_user(identity: dict, db: Session) -> User:
+    """
+    Associa à sessão um usuário montado a partir do cache, sem consultar o banco.
+    """
+    user = User(**identity)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+def invalidate_cached_user(user_id: int) -> None:
+    """
+    Remove do cache todos os tokens do usuário informado.
+    """
+    user_cache.invalidate_where(lambda identity: identity["id"] == user_id)
+
+def revoke_user_tokens(user: User) -> None:
+    """
+    Invalida todos os tokens já emitidos para o usuário (ao ser salvo),
+    inclusive nos demais workers, após a próxima sincronização da lista.
+    """
+    user.security_stamp = (user.security_stamp or 0) + 1
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target: User) -> None:
+    invalidate_cached_user(target.id)
+
+@event.listens_for(User, "after_update")
+def _record_security_stamp(mapper, connection, target: User) -> None:
+    if inspect(target).attrs.security_stamp.history.has_changes():
+        revoked_tokens.record_stamp(connection, target.id, target.security_stamp)
+
+@event.listens_for(User, "after_delete")
+def _forget_deleted_user(mapper, connection, target: User) -> None:
+    revoked_tokens.record_stamp(connection, target.id, None)
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """
+    Versão assíncrona de get_current_user, usada no modo assíncrono.
+    """
+    return await db.run_sync(lambda session: get_current_user(token, session))
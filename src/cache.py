@@ -0,0 +1,286 @@
+# src/cache.py
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Cache em memória com tamanho máximo (descarte LRU) e tempo de expiração
+    por entrada. Seguro para uso concorrente entre threads. Com `maxbytes`,
+    limita também a soma dos tamanhos das entradas, medidos por `sizeof`.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        timer: Callable[[], float] = time.monotonic,
+        maxbytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = lambda value: 0,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self.hits = 0
+        self.misses = 0
+        self._timer = timer
+        self._sizeof = sizeof
+        self._bytes = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Retorna o valor da chave, ou `default` se ausente ou expirado.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at, _ = entry
+                if expires_at > self._timer():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._remove(key)
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Armazena o valor, expirando em `ttl` segundos (limitado ao TTL do cache).
+        """
+        if self.maxsize <= 0:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        size = self._sizeof(value)
+        if self.maxbytes is not None and size > self.maxbytes:
+            return
+
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (value, self._timer() + ttl, size)
+            self._bytes += size
+            while len(self._entries) > self.maxsize or (
+                self.maxbytes is not None and self._bytes > self.maxbytes
+            ):
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Remove a chave do cache, se existir.
+        """
+        with self._lock:
+            self._remove(key)
+
+    def invalidate_where(self, predicate: Callable[[Any], bool]) -> None:
+        """
+        Remove as entradas cujo valor satisfaz o predicado.
+        """
+        with self._lock:
+            keys = [
+                key for key, (value, *_) in self._entries.items() if predicate(value)
+            ]
+            for key in keys:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """
+        Esvazia o cache e zera os contadores.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        Retorna os contadores de acertos e falhas e a ocupação do cache.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
+def response_size(value: dict) -> int:
+    """
+    Tamanho aproximado de uma resposta em cache: a soma dos textos guardados.
+    """
+    return sum(len(item) for item in value.values() if isinstance(item, str))
+
+
+class MemoryResponseCache:
+    """
+    Cache de respostas serializadas agrupadas por escopo (ex.: o usuário),
+    local ao processo. Cada entrada é gravada com a versão do escopo lida do
+    banco; quando a versão muda, as entradas anteriores deixam de ser lidas
+    e saem do cache pelo descarte LRU ou pela expiração.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, maxbytes: Optional[int] = None):
+        self._entries = TTLCache(
+            maxsize=maxsize, ttl=ttl, maxbytes=maxbytes, sizeof=response_size
+        )
+
+    def get(self, scope: Hashable, version: int, key: str) -> Optional[dict]:
+        return self._entries.get((scope, version, key))
+
+    def set(self, scope: Hashable, version: int, key: str, value: dict) -> None:
+        self._entries.set((scope, version, key), value)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return self._entries.stats()
+
+
+class SQLiteResponseCache:
+    """
+    Cache de respostas com a mesma interface do MemoryResponseCache, gravado
+    em um arquivo SQLite local e compartilhado entre os workers da aplicação.
+    """
+
+    # A limpeza de entradas expiradas e excedentes roda a cada N gravações ou
+    # quando o volume gravado desde a última limpeza passa de 1/N do limite
+    PRUNE_INTERVAL = 100
+
+    def __init__(
+        self, path: str, maxsize: int, ttl: float, maxbytes: Optional[int] = None
+    ):
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._written_bytes = 0
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _key(scope: Hashable, version: int, key: str) -> str:
+        return f"{scope}:{version}:{key}"
+
+    def get(self, scope: Hashable, version: int, key: str) -> Optional[dict]:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT value FROM entries WHERE key = ? AND expires_at > ?",
+                (self._key(scope, version, key), time.time()),
+            )
+            .fetchone()
+        )
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, scope: Hashable, version: int, key: str, value: dict) -> None:
+        if self.maxsize <= 0:
+            return
+        data = json.dumps(value)
+        if self.maxbytes is not None and len(data) > self.maxbytes:
+            return
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)",
+            (self._key(scope, version, key), data, time.time() + self.ttl),
+        )
+        self._writes += 1
+        self._written_bytes += len(data)
+        if self._writes % self.PRUNE_INTERVAL == 0 or (
+            self.maxbytes is not None
+            and self._written_bytes * self.PRUNE_INTERVAL > self.maxbytes
+        ):
+            self._prune(connection)
+
+    def _prune(self, connection: sqlite3.Connection) -> None:
+        connection.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+        connection.execute(
+            "DELETE FROM entries WHERE key IN (SELECT key FROM entries "
+            "ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self.maxsize,),
+        )
+        if self.maxbytes is not None:
+            # Mantém as entradas mais recentes cuja soma de tamanhos cabe no limite
+            connection.execute(
+                "DELETE FROM entries WHERE key IN (SELECT key FROM (SELECT key, "
+                "SUM(LENGTH(value)) OVER (ORDER BY expires_at DESC, rowid DESC) "
+                "AS total FROM entries) WHERE total > ?)",
+                (self.maxbytes,),
+            )
+        self._written_bytes = 0
+
+    def clear(self) -> None:
+        connection = self._connection()
+        connection.execute("DELETE FROM entries")
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        size = self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": size,
+            "maxsize": self.maxsize,
+        }
+
+
+class NullResponseCache(MemoryResponseCache):
+    """
+    Cache de respostas desativado: nada é armazenado.
+    """
+
+    def __init__(self):
+        super().__init__(maxsize=0, ttl=0)
+
+
+def create_response_cache(
+    backend: str,
+    maxsize: int,
+    ttl: float,
+    path: str,
+    maxbytes: Optional[int] = None,
+):
+    """
+    Cria o cache de respostas do backend configurado.
+    """
+    if backend == "memory":
+        return MemoryResponseCache(maxsize=maxsize, ttl=ttl, maxbytes=maxbytes)
+    if backend == "sqlite":
+        return SQLiteResponseCache(
+            path=path, maxsize=maxsize, ttl=ttl, maxbytes=maxbytes
+        )
+    return NullResponseCache()
@@ -1,30 +1,147 @@
 # src/database.py
 
-from typing import Generator
+import logging
+from typing import AsyncGenerator, Generator
 
+from fastapi import Request
 from sqlalchemy import (
     Boolean,
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
     create_engine,
+    event,
+    inspect,
 )
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateColumn
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, relationship, sessionmaker
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    NullPool,
+    QueuePool,
+    SingletonThreadPool,
+    StaticPool,
+)
+
+from settings import Settings
+from timing import instrument_engine
+
+logger = logging.getLogger(__name__)
+
+POOL_CLASSES = {
+    "queue": QueuePool,
+    "null": NullPool,
+    "static": StaticPool,
+    "singleton": SingletonThreadPool,
+}
+
+
+def sqlite_pragmas(settings: Settings) -> dict:
+    """
+    PRAGMAs de desempenho e integridade definidos nas configurações.
+    """
+    pragmas = {
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "mmap_size": settings.sqlite_mmap_size,
+        "cache_size": settings.sqlite_cache_size,
+        "busy_timeout": settings.sqlite_busy_timeout,
+        "foreign_keys": (
+            None
+            if settings.sqlite_foreign_keys is None
+            else "ON" if settings.sqlite_foreign_keys else "OFF"
+        ),
+    }
+    return {name: value for name, value in pragmas.items() if value not in (None, "")}
+
+
+def engine_options(url: str, settings: Settings, is_async: bool = False) -> dict:
+    """
+    Opções de create_engine para a URL, incluindo a classe e o tamanho do pool.
+    """
+    options = {}
+    if url.startswith("sqlite") and not is_async:
+        options["connect_args"] = {"check_same_thread": False}
+
+    if settings.database_pool_class:
+        pool_class = POOL_CLASSES[settings.database_pool_class]
+        if is_async and pool_class is QueuePool:
+            pool_class = AsyncAdaptedQueuePool
+        options["poolclass"] = pool_class
+        if settings.database_pool_class == "queue":
+            options["pool_size"] = settings.database_pool_size
+            options["max_overflow"] = settings.database_max_overflow
+            options["pool_timeout"] = settings.database_pool_timeout
+    return options
+
+
+def apply_sqlite_pragmas(engine: Engine, settings: Settings) -> None:
+    """
+    Registra a aplicação dos PRAGMAs em cada nova conexão do engine.
+    """
+    pragmas = sqlite_pragmas(settings)
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def create_database_engine(url: str, settings: Settings) -> Engine:
+    """
+    Cria o engine síncrono com o perfil de pool e PRAGMAs configurado.
+    """
+    engine = create_engine(url, **engine_options(url, settings))
+    if engine.dialect.name == "sqlite":
+        apply_sqlite_pragmas(engine, settings)
+    if settings.request_timing:
+        instrument_engine(engine)
+    return engine
+
+
+def create_async_database_engine(url: str, settings: Settings):
+    """
+    Cria o engine assíncrono com o mesmo perfil do engine síncrono.
+    """
+    async_engine = create_async_engine(
+        url, **engine_options(url, settings, is_async=True)
+    )
+    if async_engine.dialect.name == "sqlite":
+        apply_sqlite_pragmas(async_engine.sync_engine, settings)
+    if settings.request_timing:
+        instrument_engine(async_engine.sync_engine)
+    return async_engine
+
+
+def create_session_factory(engine: Engine) -> sessionmaker:
+    return sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+
+def create_async_session_factory(async_engine) -> async_sessionmaker:
+    # Sem expirar no commit: os objetos retornados pelos handlers são
+    # serializados fora do contexto da sessão, onde não há lazy load.
+    return async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    )
 
-DATABASE_URL = "sqlite:///./tasks.db"
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 Base = declarative_base()
 
 task_shares = Table(
     "task_shares",
     Base.metadata,
-    Column("task_id", Integer, ForeignKey("tasks.id")),
-    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("task_id", Integer, ForeignKey("tasks.id"), primary_key=True),
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    # Índice reverso para buscar as tarefas compartilhadas com um usuário
+    Index("ix_task_shares_user_id_task_id", "user_id", "task_id"),
 )
 
 
@@ -36,6 +153,14 @@ class User(Base):
     email = Column(String, unique=True, index=True)
     password = Column(String, nullable=False)
 
+    # Versão da listagem de tarefas do usuário, incrementada a cada escrita
+    # que altera as tarefas visíveis a ele (usada no ETag da listagem)
+    task_list_version = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Carimbo de segurança incluído nos tokens; incrementá-lo invalida os
+    # tokens já emitidos para o usuário
+    security_stamp = Column(Integer, nullable=False, default=0, server_default="0")
+
     # Relacionamento com as tarefas que o usuário possui
     tasks = relationship("Task", back_populates="owner")
 
@@ -47,6 +172,10 @@ class User(Base):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Garante no banco que o título seja único por usuário (RN2.1)
+        Index("ix_tasks_owner_id_title", "owner_id", "title", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String)
@@ -64,10 +193,200 @@ class Task(Base):
     )
 
 
-# Dependência para obter a sessão do banco de dados
-def get_db() -> Generator:
-    db = SessionLocal()
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    # O ID crescente permite a cada worker ler apenas as revogações novas
+    id = Column(Integer, primary_key=True)
+    jti = Column(String, unique=True, nullable=False)
+    # "access" ou "refresh"; apenas os tokens de acesso são mantidos em memória
+    token_type = Column(
+        String, nullable=False, default="access", server_default="access"
+    )
+    # Após a expiração o token já é recusado; a entrada pode ser descartada
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+class SecurityStampChange(Base):
+    __tablename__ = "security_stamp_changes"
+
+    # Carimbo de segurança novo do usuário (None se o usuário foi removido),
+    # lido pelos demais workers junto com as revogações de tokens
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    security_stamp = Column(Integer)
+    # Após a expiração dos tokens com o carimbo anterior, pode ser descartada
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+# Índice de busca textual (FTS5) sobre título e descrição das tarefas. Usa a
+# própria tabela tasks como conteúdo e é mantido em sincronia por triggers.
+TASK_SEARCH_TABLE = "tasks_fts"
+TASK_SEARCH_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {TASK_SEARCH_TABLE} USING fts5("
+    "title, description, content='tasks', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    f"CREATE TRIGGER IF NOT EXISTS {TASK_SEARCH_TABLE}_insert AFTER INSERT ON tasks "
+    f"BEGIN INSERT INTO {TASK_SEARCH_TABLE} (rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS {TASK_SEARCH_TABLE}_delete AFTER DELETE ON tasks "
+    f"BEGIN INSERT INTO {TASK_SEARCH_TABLE} ({TASK_SEARCH_TABLE}, rowid, title, "
+    f"description) VALUES ('delete', old.id, old.title, old.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS {TASK_SEARCH_TABLE}_update "
+    "AFTER UPDATE OF title, description ON tasks "
+    f"BEGIN INSERT INTO {TASK_SEARCH_TABLE} ({TASK_SEARCH_TABLE}, rowid, title, "
+    "description) VALUES ('delete', old.id, old.title, old.description); "
+    f"INSERT INTO {TASK_SEARCH_TABLE} (rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+)
+
+
+def create_task_search_index(connection) -> None:
+    """
+    Cria o índice de busca das tarefas e os triggers que o mantêm.
+    """
+    for statement in TASK_SEARCH_DDL:
+        connection.exec_driver_sql(statement)
+
+
+@event.listens_for(Task.__table__, "after_create")
+def _create_task_search_index_with_table(target, connection, **kw) -> None:
+    if connection.dialect.name == "sqlite":
+        create_task_search_index(connection)
+
+
+@event.listens_for(Task.__table__, "before_drop")
+def _drop_task_search_index_with_table(target, connection, **kw) -> None:
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {TASK_SEARCH_TABLE}")
+
+
+def migrate(bind) -> None:
+    """
+    Cria as tabelas que ainda não existem e aplica as migrações. Executado
+    explicitamente (`make migrate`), e não ao importar ou iniciar a aplicação.
+    """
+    Base.metadata.create_all(bind=bind)
+    run_migrations(bind)
+
+
+def run_migrations(bind) -> None:
+    """
+    Aplica ao banco existente as alterações de esquema que o create_all não faz.
+    """
+    _rebuild_task_shares_with_primary_key(bind)
+    _add_missing_columns(bind)
+    _rename_duplicate_task_titles(bind)
+    _add_task_search_index(bind)
+
+    # Tabelas novas (ainda não criadas pelo create_all) já nascem com os índices
+    existing = set(inspect(bind).get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing:
+            continue
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+
+
+def _rebuild_task_shares_with_primary_key(bind) -> None:
+    """
+    Recria a tabela task_shares de bancos antigos, que não tinham chave
+    primária, removendo compartilhamentos duplicados.
+    """
+    inspector = inspect(bind)
+    if not inspector.has_table("task_shares"):
+        return
+    if inspector.get_pk_constraint("task_shares")["constrained_columns"]:
+        return
+
+    with bind.begin() as connection:
+        connection.exec_driver_sql("ALTER TABLE task_shares RENAME TO task_shares_old")
+        task_shares.create(bind=connection)
+        connection.exec_driver_sql(
+            "INSERT INTO task_shares (task_id, user_id) "
+            "SELECT DISTINCT task_id, user_id FROM task_shares_old "
+            "WHERE task_id IS NOT NULL AND user_id IS NOT NULL"
+        )
+        connection.exec_driver_sql("DROP TABLE task_shares_old")
+
+
+def _add_missing_columns(bind) -> None:
+    """
+    Adiciona às tabelas existentes as colunas novas do modelo.
+    """
+    inspector = inspect(bind)
+    with bind.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = CreateColumn(column).compile(dialect=connection.dialect)
+                connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+
+
+def _rename_duplicate_task_titles(bind) -> None:
+    """
+    Antes de criar o índice único (owner_id, title) em bancos antigos,
+    renomeia as tarefas com título repetido para o mesmo dono, mantendo a
+    mais antiga e acrescentando o ID às demais (ex.: "Compras (42)").
+    """
+    inspector = inspect(bind)
+    if not inspector.has_table("tasks"):
+        return
+    if "ix_tasks_owner_id_title" in {
+        index["name"] for index in inspector.get_indexes("tasks")
+    }:
+        return
+
+    with bind.begin() as connection:
+        duplicates = connection.exec_driver_sql(
+            "SELECT id, owner_id, title FROM tasks AS task WHERE EXISTS ("
+            "SELECT 1 FROM tasks AS other WHERE other.owner_id = task.owner_id "
+            "AND other.title = task.title AND other.id < task.id)"
+        ).all()
+        for task_id, owner_id, title in duplicates:
+            connection.exec_driver_sql(
+                "UPDATE tasks SET title = ? WHERE id = ?",
+                (f"{title} ({task_id})", task_id),
+            )
+            logger.warning(
+                "Tarefa %s do usuário %s renomeada de %r para %r (título duplicado)",
+                task_id,
+                owner_id,
+                title,
+                f"{title} ({task_id})",
+            )
+
+
+def _add_task_search_index(bind) -> None:
+    """
+    Cria o índice de busca em bancos anteriores a ele e o popula com as
+    tarefas existentes.
+    """
+    if bind.dialect.name != "sqlite" or inspect(bind).has_table(TASK_SEARCH_TABLE):
+        return
+
+    with bind.begin() as connection:
+        create_task_search_index(connection)
+        connection.exec_driver_sql(
+            f"INSERT INTO {TASK_SEARCH_TABLE} ({TASK_SEARCH_TABLE}) VALUES ('rebuild')"
+        )
+
+
+# Dependência para obter a sessão do banco de dados. As fábricas de sessão
+# são criadas na inicialização da aplicação (ver main.create_app).
+def get_db(request: Request) -> Generator:
+    db = request.app.state.session_factory()
     try:
         yield db
     finally:
         db.close()
+
+
+# Dependência para obter a sessão assíncrona do banco de dados
+async def get_async_db(request: Request) -> AsyncGenerator:
+    async with request.app.state.async_session_factory() as db:
+        yield db
@@ -1,16 +1,141 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from auth import password_executor, user_cache
+from metrics import MetricsMiddleware, MetricsRegistry, instrument_pool
 from routers import user, task
-from database import Base, engine
+from routers.async_routes import to_async_router
+from database import (
+    create_async_database_engine,
+    create_async_session_factory,
+    create_database_engine,
+    create_session_factory,
+    migrate,
+)
+from settings import Settings, settings
+from timing import RequestTimingMiddleware
 
-# Criação das tabelas no banco de dados (se ainda não existirem)
-Base.metadata.create_all(bind=engine)
 
-app = FastAPI(
-    title="Gerenciador de Tarefas",
-    description="API para gerenciamento de tarefas com autenticação de usuários",
-    version="1.0.0"
+# Configurações lidas na importação dos módulos (validade dos tokens, caches,
+# lista de revogação, pool do bcrypt e serialização da listagem): valem para o
+# processo inteiro e vêm sempre das variáveis de ambiente
+PROCESS_SETTINGS = (
+    "auth_stateless_tokens",
+    "access_token_expire_minutes",
+    "refresh_token_expire_days",
+    "token_revocation_sync_interval",
+    "user_cache_size",
+    "user_cache_ttl",
+    "task_list_cache_backend",
+    "task_list_cache_size",
+    "task_list_cache_max_bytes",
+    "task_list_cache_ttl",
+    "task_list_cache_path",
+    "task_serialization",
+    "password_workers",
+    "password_max_pending",
 )
 
-# Inclusão dos roteadores
-app.include_router(user.router)
-app.include_router(task.router)
+
+def collect_runtime_metrics() -> list:
+    """
+    Amostras lidas no momento da coleta: fila do bcrypt e uso dos caches.
+    """
+    samples = [("password_queue_depth", (), password_executor.queue_depth)]
+    for name, cache in (("user", user_cache), ("task_list", task.task_list_cache)):
+        stats = cache.stats()
+        labels = (("cache", name),)
+        samples.append(("cache_hits_total", labels, stats["hits"]))
+        samples.append(("cache_misses_total", labels, stats["misses"]))
+        samples.append(("cache_entries", labels, stats["size"]))
+    return samples
+
+
+def create_app(app_settings: Settings = settings) -> FastAPI:
+    """
+    Cria a aplicação. Os engines são criados na inicialização (lifespan) e
+    descartados no encerramento; nada acessa o banco ao importar o módulo.
+    Os campos de PROCESS_SETTINGS não podem diferir das variáveis de
+    ambiente: a fábrica rejeita as configurações que não aplicaria.
+    """
+    ignored = [
+        name for name in PROCESS_SETTINGS
+        if getattr(app_settings, name) != getattr(settings, name)
+    ]
+    if ignored:
+        raise ValueError(
+            "Configurações definidas apenas pelas variáveis de ambiente: "
+            + ", ".join(ignored)
+        )
+
+    # Métricas do processo, expostas em /metrics
+    metrics = MetricsRegistry(
+        directory=app_settings.metrics_dir,
+        flush_interval=app_settings.metrics_flush_interval,
+    )
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        engine = create_database_engine(app_settings.database_url, app_settings)
+        if app_settings.migrate_on_startup:
+            migrate(engine)
+        app.state.engine = engine
+        app.state.session_factory = create_session_factory(engine)
+        pool_engines = [engine]
+
+        async_engine = None
+        if app_settings.database_async:
+            async_engine = create_async_database_engine(
+                app_settings.resolved_async_database_url(), app_settings
+            )
+            app.state.async_session_factory = create_async_session_factory(async_engine)
+            pool_engines.append(async_engine.sync_engine)
+
+        if app_settings.metrics_enabled:
+            for pool_engine in pool_engines:
+                instrument_pool(metrics, pool_engine)
+            metrics.start_flushing()
+        yield
+        password_executor.shutdown()
+        if app_settings.metrics_enabled:
+            metrics.flush()
+        if async_engine is not None:
+            await async_engine.dispose()
+        engine.dispose()
+
+    app = FastAPI(
+        lifespan=lifespan,
+        title="Gerenciador de Tarefas",
+        description="API para gerenciamento de tarefas com autenticação de usuários",
+        version="1.0.0"
+    )
+    app.state.metrics = metrics
+
+    # Medição por requisição com o cabeçalho Server-Timing (opcional)
+    if app_settings.request_timing:
+        app.add_middleware(RequestTimingMiddleware)
+
+    # Métricas no formato do Prometheus (contagem e latência por rota, pool de
+    # conexões, fila do bcrypt e caches)
+    if app_settings.metrics_enabled:
+        metrics.add_collector(collect_runtime_metrics)
+        app.add_middleware(MetricsMiddleware, registry=metrics)
+
+        @app.get("/metrics", include_in_schema=False)
+        def metrics_endpoint():
+            return PlainTextResponse(
+                metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+            )
+
+    # Inclusão dos roteadores (no modo assíncrono, com endpoints async)
+    for router in (user.router, task.router):
+        app.include_router(
+            to_async_router(router) if app_settings.database_async else router
+        )
+
+    return app
+
+
+# Aplicação com as configurações do ambiente (uvicorn main:app)
+app = create_app()
@@ -0,0 +1,329 @@
+# src/metrics.py
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Optional
+
+from sqlalchemy import event
+
+# Limites (em segundos) dos buckets dos histogramas de latência
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+METRIC_HELP = {
+    "http_requests_total": ("counter", "Requisições HTTP atendidas"),
+    "http_request_duration_seconds": ("histogram", "Latência das requisições HTTP"),
+    "http_requests_in_flight": ("gauge", "Requisições HTTP em andamento"),
+    "db_pool_checkouts_total": ("counter", "Conexões retiradas do pool"),
+    "db_pool_connections_total": ("counter", "Conexões abertas pelo pool"),
+    "db_pool_checked_out": ("gauge", "Conexões do pool em uso"),
+    "db_pool_checkout_wait_seconds": (
+        "histogram",
+        "Tempo de espera por uma conexão do pool",
+    ),
+    "password_queue_depth": ("gauge", "Trabalhos de bcrypt em execução ou na fila"),
+    "cache_hits_total": ("counter", "Acertos do cache"),
+    "cache_misses_total": ("counter", "Falhas do cache"),
+    "cache_entries": ("gauge", "Entradas armazenadas no cache"),
+}
+
+
+class MetricsRegistry:
+    """
+    Métricas do processo. Cada thread incrementa apenas o seu próprio
+    fragmento (um dict), sem locks; a leitura soma os fragmentos de todas as
+    threads. Com `directory`, cada worker grava periodicamente suas amostras
+    em um arquivo e a exposição soma os arquivos de todos os workers.
+    """
+
+    def __init__(self, directory: Optional[str] = None, flush_interval: float = 5.0):
+        self.directory = Path(directory) if directory else None
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._shards: list = []
+        self._collectors: list = []
+        self._flusher: Optional[threading.Thread] = None
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            self._shards.append(shard)
+        return shard
+
+    def inc(self, name: str, labels: tuple = (), amount: float = 1) -> None:
+        """
+        Incrementa um contador (ou gauge, com `amount` negativo).
+        """
+        shard = self._shard()
+        key = (name, labels)
+        shard[key] = shard.get(key, 0) + amount
+
+    def observe(self, name: str, labels: tuple, value: float, buckets=LATENCY_BUCKETS):
+        """
+        Registra uma observação no histograma (contagem por bucket, soma e total).
+        """
+        shard = self._shard()
+        bucket = (name + "_bucket", labels + (("le", bisect_left(buckets, value)),))
+        shard[bucket] = shard.get(bucket, 0) + 1
+        for key, amount in (
+            ((name + "_sum", labels), value),
+            ((name + "_count", labels), 1),
+        ):
+            shard[key] = shard.get(key, 0) + amount
+
+    def add_collector(self, collector: Callable[[], list]) -> None:
+        """
+        Registra uma função que retorna amostras (nome, labels, valor) lidas
+        no momento da coleta, como a profundidade da fila do bcrypt.
+        """
+        self._collectors.append(collector)
+
+    def samples(self) -> dict:
+        """
+        Amostras deste processo: a soma dos fragmentos mais os coletores.
+        """
+        totals: dict = {}
+        for shard in list(self._shards):
+            # A cópia de um dict é atômica em relação às demais threads
+            for key, value in shard.copy().items():
+                totals[key] = totals.get(key, 0) + value
+        for collector in self._collectors:
+            for name, labels, value in collector():
+                totals[(name, labels)] = totals.get((name, labels), 0) + value
+        return totals
+
+    def _snapshot_path(self, pid: int) -> Path:
+        return self.directory / f"metrics-{pid}.json"
+
+    def flush(self) -> None:
+        """
+        Grava as amostras deste worker no diretório compartilhado.
+        """
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        payload = [
+            [name, list(map(list, labels)), value]
+            for (name, labels), value in self.samples().items()
+        ]
+        path = self._snapshot_path(os.getpid())
+        temporary = path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(payload))
+        temporary.replace(path)
+
+    def start_flushing(self) -> None:
+        """
+        Inicia a gravação periódica das amostras (apenas com `directory`).
+        """
+        if self.directory is None or self._flusher is not None:
+            return
+
+        def run():
+            while True:
+                time.sleep(self.flush_interval)
+                self.flush()
+
+        self._flusher = threading.Thread(target=run, name="metrics-flush", daemon=True)
+        self._flusher.start()
+
+    def collect(self) -> dict:
+        """
+        Amostras de todos os workers. Gauges de workers encerrados são
+        descartados; contadores e histogramas continuam somados.
+        """
+        if self.directory is None:
+            return self.samples()
+
+        self.flush()
+        totals: dict = {}
+        for path in self.directory.glob("metrics-*.json"):
+            pid = int(path.stem.split("-")[1])
+            alive = _process_alive(pid)
+            try:
+                payload = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            for name, labels, value in payload:
+                if not alive and METRIC_HELP.get(name, ("gauge",))[0] == "gauge":
+                    continue
+                key = (name, tuple(map(tuple, labels)))
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def render(self) -> str:
+        """
+        Exposição das métricas no formato texto do Prometheus.
+        """
+        samples = self.collect()
+        lines = []
+        for metric, (kind, help_text) in METRIC_HELP.items():
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            if kind == "histogram":
+                lines.extend(_render_histogram(metric, samples))
+                continue
+            series = [
+                (key[1], value) for key, value in samples.items() if key[0] == metric
+            ]
+            for labels, value in sorted(series):
+                lines.append(_line(metric, labels, value))
+        return "\n".join(lines) + "\n"
+
+
+def _render_histogram(metric: str, samples: dict) -> list:
+    series: dict = {}
+    for (name, labels), value in samples.items():
+        if name == metric + "_bucket":
+            *base, (_, index) = labels
+            series.setdefault(tuple(base), {})[index] = value
+        elif name in (metric + "_sum", metric + "_count"):
+            series.setdefault(labels, {})
+
+    lines = []
+    for labels, buckets in sorted(series.items()):
+        count = samples.get((metric + "_count", labels), 0)
+        total = samples.get((metric + "_sum", labels), 0)
+        cumulative = 0
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            cumulative += buckets.get(index, 0)
+            lines.append(
+                _line(f"{metric}_bucket", labels + (("le", bound),), cumulative)
+            )
+        lines.append(_line(f"{metric}_bucket", labels + (("le", "+Inf"),), count))
+        lines.append(_line(f"{metric}_sum", labels, total))
+        lines.append(_line(f"{metric}_count", labels, count))
+    return lines
+
+
+def _line(name: str, labels: tuple, value: float) -> str:
+    """
+    Uma amostra no formato texto: nome{label="valor",...} valor
+    """
+    if isinstance(value, float) and not value.is_integer():
+        formatted = repr(value)
+    else:
+        formatted = str(int(value))
+    if not labels:
+        return f"{name} {formatted}"
+    pairs = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+    return f"{name}{{{pairs}}} {formatted}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _process_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def instrument_pool(registry: MetricsRegistry, engine) -> None:
+    """
+    Contabiliza as retiradas de conexões do pool do engine e o tempo de
+    espera por elas.
+    """
+
+    @event.listens_for(engine, "checkout")
+    def count_checkout(dbapi_connection, connection_record, connection_proxy):
+        registry.inc("db_pool_checkouts_total")
+        registry.inc("db_pool_checked_out")
+
+    @event.listens_for(engine, "checkin")
+    def count_checkin(dbapi_connection, connection_record):
+        registry.inc("db_pool_checked_out", amount=-1)
+
+    @event.listens_for(engine, "connect")
+    def count_connect(dbapi_connection, connection_record):
+        registry.inc("db_pool_connections_total")
+
+    # O SQLAlchemy não tem evento anterior à espera pela conexão; mede a
+    # obtenção no próprio pool, refeita quando o engine recria o pool
+    def time_pool(pool):
+        do_get = pool._do_get
+
+        def timed_do_get():
+            started = time.perf_counter()
+            try:
+                return do_get()
+            finally:
+                registry.observe(
+                    "db_pool_checkout_wait_seconds", (), time.perf_counter() - started
+                )
+
+        pool._do_get = timed_do_get
+
+    time_pool(engine.pool)
+    event.listen(engine, "engine_disposed", lambda engine: time_pool(engine.pool))
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que conta as requisições por rota e status, mede sua
+    latência e mantém o número de requisições em andamento.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry):
+        self.app = app
+        self.registry = registry
+        self._routes: Optional[dict] = None
+
+    def _route_path(self, scope) -> str:
+        # O roteador grava o endpoint escolhido no scope; o path da rota
+        # (ex.: /tasks/{task_id}) evita uma série por ID
+        if self._routes is None:
+            self._routes = {
+                route.endpoint: route.path
+                for route in scope["app"].routes
+                if hasattr(route, "endpoint")
+            }
+        return self._routes.get(scope.get("endpoint"), "unmatched")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        registry = self.registry
+        registry.inc("http_requests_in_flight")
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - started
+            registry.inc("http_requests_in_flight", amount=-1)
+            route = (("method", scope["method"]), ("route", self._route_path(scope)))
+            registry.inc("http_requests_total", route + (("status", str(status_code)),))
+            registry.observe("http_request_duration_seconds", route, duration)
@@ -0,0 +1,11 @@
+# src/migrate.py
+
+from database import create_database_engine, migrate
+from settings import settings
+
+if __name__ == "__main__":
+    # Cria as tabelas e aplica as migrações ao banco configurado (DATABASE_URL)
+    engine = create_database_engine(settings.database_url, settings)
+    migrate(engine)
+    engine.dispose()
+    print(f"Banco migrado: {settings.database_url}")
@@ -0,0 +1,96 @@
+# src/passwords.py
+
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Callable
+
+from passlib.context import CryptContext
+from sqlalchemy.util.concurrency import await_only, in_greenlet
+
+# Este módulo é importado pelos processos do pool: mantenha-o sem
+# dependências da aplicação (banco, rotas, configurações).
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def hash_password(password: str) -> str:
+    """
+    Gera o hash bcrypt da senha.
+    """
+    return pwd_context.hash(password)
+
+
+def check_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verifica a senha contra o hash bcrypt.
+    """
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordPoolSaturated(Exception):
+    """
+    Levantada quando a fila de trabalhos de senha está cheia.
+    """
+
+
+class PasswordExecutor:
+    """
+    Executa o trabalho de senha (bcrypt) em um pool de processos dedicado,
+    com limite de trabalhos pendentes. Com `workers=0` executa na própria thread.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor = None
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Quantidade de trabalhos em execução ou aguardando no pool.
+        """
+        return self._pending
+
+    def run(self, func: Callable, *args):
+        """
+        Executa `func(*args)` no pool e aguarda o resultado. Dentro de
+        AsyncSession.run_sync, aguarda sem bloquear o event loop (mesmo sem
+        pool, quando executa em uma thread).
+        """
+        if self.workers <= 0:
+            # Sem pool, no modo assíncrono o bcrypt vai para uma thread em
+            # vez de bloquear o event loop
+            if in_greenlet():
+                return await_only(asyncio.to_thread(func, *args))
+            return func(*args)
+
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise PasswordPoolSaturated()
+            self._pending += 1
+            if self._executor is None:
+                # "spawn" evita herdar threads e conexões do processo da API
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=get_context("spawn")
+                )
+
+        try:
+            future = self._executor.submit(func, *args)
+            if in_greenlet():
+                return await_only(asyncio.wrap_future(future))
+            return future.result()
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def shutdown(self) -> None:
+        """
+        Encerra os processos do pool, se tiverem sido criados.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
@@ -0,0 +1,207 @@
+# src/revocation.py
+
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, event, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, SessionTransaction
+
+from database import RevokedToken, SecurityStampChange
+
+# Revogações gravadas na sessão, aplicadas em memória somente após o commit
+PENDING_REVOCATIONS_KEY = "pending_revocations"
+
+
+class RevocationList:
+    """
+    Identificadores (jti) dos tokens de acesso revogados, mantidos em memória
+    para que a verificação a cada requisição seja uma consulta a um dict. A
+    lista é persistida na tabela revoked_tokens; cada worker carrega as
+    revogações no primeiro uso e, a cada `sync_interval` segundos, lê apenas
+    as novas. Só o logout revoga tokens de acesso, e cada entrada dura até a
+    expiração do token, o que limita o tamanho do dict.
+
+    Os refresh tokens revogados (a cada renovação e no logout) ficam apenas
+    na tabela: o uso único é garantido pela chave única do jti, que recusa a
+    segunda revogação no commit.
+
+    Da mesma forma, guarda o carimbo de segurança atual dos usuários cujo
+    carimbo mudou (tabela security_stamp_changes) durante `stamp_lifetime`,
+    a validade máxima dos tokens emitidos com o carimbo anterior.
+    """
+
+    def __init__(
+        self,
+        sync_interval: float = 5.0,
+        stamp_lifetime: timedelta = timedelta(days=30),
+    ):
+        self.sync_interval = sync_interval
+        self.stamp_lifetime = stamp_lifetime
+        self._expires: dict = {}
+        self._stamps: dict = {}
+        self._last_id = 0
+        self._last_stamp_id = 0
+        self._synced_at = None
+        self._lock = threading.Lock()
+
+    def __contains__(self, jti: str) -> bool:
+        return jti in self._expires
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def accepts_stamp(self, user_id: int, stamp: Optional[int]) -> bool:
+        """
+        Indica se o carimbo do token ainda é válido: o usuário não teve o
+        carimbo alterado, ou o token foi emitido com o carimbo atual.
+        """
+        entry = self._stamps.get(user_id)
+        if entry is None:
+            return True
+        current = entry[0]
+        return current is not None and stamp is not None and stamp >= current
+
+    def _apply_stamp(
+        self, user_id: int, stamp: Optional[int], expires_at: datetime
+    ) -> None:
+        # Os carimbos só crescem; a remoção do usuário (None) prevalece
+        entry = self._stamps.get(user_id)
+        if entry is not None and (
+            entry[0] is None or (stamp is not None and stamp <= entry[0])
+        ):
+            stamp = entry[0]
+            expires_at = max(expires_at, entry[1])
+        self._stamps[user_id] = (stamp, expires_at)
+
+    def sync(self, db: Session) -> None:
+        """
+        Lê as revogações gravadas desde a última leitura, no máximo uma vez
+        por intervalo. Uma thread sincronizando não bloqueia as demais,
+        exceto na primeira leitura, sem a qual nenhuma verificação vale.
+        Requer as tabelas criadas pelas migrações (`make migrate`).
+        """
+        synced_at = self._synced_at
+        if synced_at is not None and time.monotonic() - synced_at < self.sync_interval:
+            return
+        if not self._lock.acquire(blocking=synced_at is None):
+            return
+        try:
+            if synced_at is None and self._synced_at is not None:
+                return
+            now = datetime.utcnow()
+            rows = db.execute(
+                select(RevokedToken.id, RevokedToken.jti, RevokedToken.expires_at)
+                .where(RevokedToken.id > self._last_id)
+                .where(RevokedToken.token_type == "access")
+                .where(RevokedToken.expires_at > now)
+                .order_by(RevokedToken.id)
+            ).all()
+            for row in rows:
+                self._expires[row.jti] = row.expires_at
+                self._last_id = row.id
+            changes = db.execute(
+                select(
+                    SecurityStampChange.id,
+                    SecurityStampChange.user_id,
+                    SecurityStampChange.security_stamp,
+                    SecurityStampChange.expires_at,
+                )
+                .where(SecurityStampChange.id > self._last_stamp_id)
+                .where(SecurityStampChange.expires_at > now)
+                .order_by(SecurityStampChange.id)
+            ).all()
+            for change in changes:
+                self._apply_stamp(
+                    change.user_id, change.security_stamp, change.expires_at
+                )
+                self._last_stamp_id = change.id
+            # Tokens expirados já são recusados pela validação do JWT
+            for jti, expires_at in list(self._expires.items()):
+                if expires_at <= now:
+                    self._expires.pop(jti, None)
+            for user_id, (_, expires_at) in list(self._stamps.items()):
+                if expires_at <= now:
+                    self._stamps.pop(user_id, None)
+            self._synced_at = time.monotonic()
+        finally:
+            self._lock.release()
+
+    def revoke(
+        self,
+        db: Session,
+        jti: str,
+        expires_at: datetime,
+        token_type: str = "access",
+    ) -> bool:
+        """
+        Revoga o token, gravando-o na sessão e descartando da tabela as
+        revogações já expiradas. Tokens de acesso passam a valer em memória
+        após o commit de quem chama; uma revogação repetida ou concorrente do
+        mesmo token falha no commit pela chave única do jti. Retorna False se
+        o token já estava revogado em memória.
+        """
+        if jti in self._expires:
+            return False
+        db.execute(
+            delete(RevokedToken).where(RevokedToken.expires_at <= datetime.utcnow())
+        )
+        db.add(RevokedToken(jti=jti, expires_at=expires_at, token_type=token_type))
+        if token_type == "access":
+            db.info.setdefault(PENDING_REVOCATIONS_KEY, []).append(
+                (self, jti, expires_at)
+            )
+        return True
+
+    def _apply(self, jti: str, expires_at: datetime) -> None:
+        with self._lock:
+            self._expires[jti] = expires_at
+
+    def record_stamp(
+        self, connection: Connection, user_id: int, stamp: Optional[int]
+    ) -> None:
+        """
+        Registra o novo carimbo do usuário (None se removido) na transação em
+        andamento, para os demais workers, e o aplica neste processo.
+        """
+        now = datetime.utcnow()
+        expires_at = now + self.stamp_lifetime
+        self._apply_stamp(user_id, stamp, expires_at)
+        connection.execute(
+            delete(SecurityStampChange).where(SecurityStampChange.expires_at <= now)
+        )
+        connection.execute(
+            insert(SecurityStampChange).values(
+                user_id=user_id, security_stamp=stamp, expires_at=expires_at
+            )
+        )
+
+    def clear(self) -> None:
+        """
+        Esvazia a lista, considerando-a sincronizada com um banco sem revogações.
+        """
+        self._expires.clear()
+        self._stamps.clear()
+        self._last_id = 0
+        self._last_stamp_id = 0
+        self._synced_at = time.monotonic()
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed_revocations(session: Session) -> None:
+    """
+    Aplica em memória as revogações confirmadas pelo commit.
+    """
+    for revocations, jti, expires_at in session.info.pop(PENDING_REVOCATIONS_KEY, ()):
+        revocations._apply(jti, expires_at)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_pending_revocations(
+    session: Session, transaction: SessionTransaction
+) -> None:
+    # Transação encerrada sem commit (rollback ou sessão fechada)
+    if transaction.parent is None:
+        session.info.pop(PENDING_REVOCATIONS_KEY, None)
@@ -0,0 +1,86 @@
+# src/routers/async_routes.py
+
+import inspect
+
+from fastapi import APIRouter, Depends
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth import get_current_user, get_current_user_async
+from database import get_async_db, get_db
+
+# Dependências síncronas e suas equivalentes assíncronas
+ASYNC_DEPENDENCIES = {
+    get_db: get_async_db,
+    get_current_user: get_current_user_async,
+}
+
+
+def keep_sync(handler):
+    """
+    Marca um handler para permanecer síncrono (no threadpool) no modo
+    assíncrono, como os de streaming, cujo gerador usa uma sessão síncrona
+    própria, e os que leem arquivos enviados.
+    """
+    handler.keep_sync = True
+    return handler
+
+
+def to_async_endpoint(handler):
+    """
+    Converte um handler síncrono em um endpoint async que recebe uma
+    AsyncSession e executa o handler via run_sync, sem ocupar o threadpool.
+    """
+    signature = inspect.signature(handler)
+    parameters = []
+    db_param = None
+    for param in signature.parameters.values():
+        dependency = getattr(param.default, "dependency", None)
+        if dependency in ASYNC_DEPENDENCIES:
+            annotation = param.annotation
+            if dependency is get_db:
+                db_param = param.name
+                annotation = AsyncSession
+            param = param.replace(
+                default=Depends(ASYNC_DEPENDENCIES[dependency]),
+                annotation=annotation,
+            )
+        parameters.append(param)
+
+    if db_param is None:
+        raise ValueError(f"{handler.__name__} não depende de get_db")
+
+    async def endpoint(**kwargs):
+        db = kwargs.pop(db_param)
+        return await db.run_sync(
+            lambda session: handler(**kwargs, **{db_param: session})
+        )
+
+    endpoint.__name__ = handler.__name__
+    endpoint.__doc__ = handler.__doc__
+    endpoint.__signature__ = signature.replace(parameters=parameters)
+    return endpoint
+
+
+def to_async_router(router: APIRouter) -> APIRouter:
+    """
+    Cria uma cópia do roteador com os endpoints convertidos para async.
+    """
+    async_router = APIRouter()
+    for route in router.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        endpoint = route.endpoint
+        if not getattr(endpoint, "keep_sync", False):
+            endpoint = to_async_endpoint(endpoint)
+        async_router.add_api_route(
+            route.path,
+            endpoint,
+            methods=list(route.methods),
+            response_model=route.response_model,
+            status_code=route.status_code,
+            tags=route.tags,
+            name=route.name,
+            response_class=route.response_class,
+        )
+    return async_router
@@ -1,20 +1,123 @@
 # src/routers/task.py
 
+import base64
+import binascii
+import csv
+import io
+import json
+import logging
+import re
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Optional
+from typing import Annotated, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, EmailStr, constr
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import (
+    BaseModel,
+    EmailStr,
+    TypeAdapter,
+    ValidationError,
+    conlist,
+    constr,
+)
+from pydantic_core import to_json
+from sqlalchemy import (
+    delete,
+    func,
+    column,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    table,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from auth import get_current_user
-from database import Task, User, get_db
+from cache import create_response_cache
+from routers.async_routes import keep_sync
+from database import TASK_SEARCH_TABLE, Task, User, get_db, task_shares
+from settings import settings
+from timing import phase
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/tasks",
     tags=["Tasks"],
 )
 
+# Paginação por cursor (keyset) da listagem de tarefas
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TASK_SORT_KEYS = {"id": Task.id, "title": Task.title}
+
+# Cache das listagens já serializadas, por usuário. As entradas são
+# indexadas pela versão da listagem gravada no banco, que toda escrita
+# incrementa; assim uma escrita feita em outro worker também as invalida.
+task_list_cache = create_response_cache(
+    settings.task_list_cache_backend,
+    maxsize=settings.task_list_cache_size,
+    ttl=settings.task_list_cache_ttl,
+    path=settings.task_list_cache_path,
+    maxbytes=settings.task_list_cache_max_bytes,
+)
+
+# Busca textual no índice FTS5 das tarefas; `rank` é o bm25 (menor = melhor)
+MAX_SEARCH_LENGTH = 200
+task_search = table(TASK_SEARCH_TABLE, column("rowid"), column("rank"))
+
+DUPLICATE_TITLE_DETAIL = "Você já possui uma tarefa com este título"
+# Colunas do índice único (owner_id, title) na mensagem de violação do SQLite
+DUPLICATE_TITLE_CONSTRAINT = "tasks.owner_id, tasks.title"
+
+# Quantidade máxima de itens por requisição nos endpoints em lote
+MAX_BATCH_SIZE = 1000
+
+TASK_NOT_FOUND_DETAIL = "Tarefa não encontrada"
+TASK_CONFLICT_DETAIL = "Tarefa alterada por outra requisição"
+# Exportação em streaming
+EXPORT_CHUNK_SIZE = 500
+EXPORT_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.is_completed,
+    Task.completion_date,
+    Task.owner_id,
+)
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Importação em blocos
+IMPORT_CHUNK_SIZE = 500
+MAX_IMPORT_ERRORS = 1000
+IMPORT_CONFLICT_DETAIL = (
+    "Bloco não importado: título criado por outra requisição durante a importação"
+)
+
+SHARE_TASK_NOT_FOUND_DETAIL = (
+    "Tarefa não encontrada ou você não tem permissão para compartilhá-la"
+)
+SHARE_USER_NOT_FOUND_DETAIL = "Usuário para compartilhamento não encontrado"
+ALREADY_SHARED_DETAIL = "Tarefa já está compartilhada com este usuário"
+
 
 # Schemas
 class TaskCreate(BaseModel):
@@ -39,10 +142,370 @@ class TaskResponse(BaseModel):
         orm_mode = True
 
 
+TASK_LIST_ADAPTER = TypeAdapter(List[TaskResponse])
+
+# Campos da resposta selecionáveis com `fields=` na listagem
+TASK_RESPONSE_FIELDS = tuple(TaskResponse.model_fields)
+
+
 class ShareTask(BaseModel):
     user_email: EmailStr
 
 
+class TaskBatchCreate(BaseModel):
+    tasks: conlist(TaskCreate, min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class TaskBatchResult(BaseModel):
+    index: int
+    status_code: int
+    task: Optional[TaskResponse] = None
+    detail: Optional[str] = None
+
+
+class TaskIds(BaseModel):
+    ids: conlist(int, min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class TaskIdResult(BaseModel):
+    id: int
+    status_code: int
+    detail: Optional[str] = None
+
+
+class ShareTaskBatch(BaseModel):
+    user_emails: conlist(EmailStr, min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class ShareResult(BaseModel):
+    user_email: str
+    status_code: int
+    detail: Optional[str] = None
+
+
+class TaskCounts(BaseModel):
+    total: int = 0
+    completed: int = 0
+    pending: int = 0
+
+
+class TaskSummary(TaskCounts):
+    owned: TaskCounts
+    shared: TaskCounts
+
+
+class TaskImportError(BaseModel):
+    line: int
+    detail: str
+
+
+class TaskImportResult(BaseModel):
+    processed: int
+    created: int
+    failed: int
+    errors: List[TaskImportError]
+
+
+# Cursores
+
+# Tipos aceitos para o valor da chave de ordenação em cada tipo de cursor
+CURSOR_VALUE_TYPES = {
+    "id": (type(None),),
+    "title": (str,),
+    "rank": (int, float),
+}
+
+
+def encode_cursor(sort_by: str, task: Task) -> str:
+    """
+    Gera um cursor opaco apontando para a última tarefa de uma página.
+    """
+    value = None if sort_by == "id" else getattr(task, sort_by)
+    payload = json.dumps([sort_by, value, task.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str) -> tuple:
+    """
+    Recupera a chave de ordenação e o ID contidos em um cursor.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, value, task_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        cursor_sort, value, task_id = None, None, None
+
+    if (
+        cursor_sort != sort_by
+        or not isinstance(task_id, int)
+        or isinstance(task_id, bool)
+        or not isinstance(value, CURSOR_VALUE_TYPES[sort_by])
+        or isinstance(value, bool)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido",
+        )
+    return value, task_id
+
+
+def is_duplicate_title(error: IntegrityError) -> bool:
+    """
+    Indica se a violação é a do índice único (owner_id, title) das tarefas.
+    """
+    return DUPLICATE_TITLE_CONSTRAINT in str(error.orig)
+
+
+@contextmanager
+def rejecting_duplicate_title(db: Session):
+    """
+    Converte a violação do índice único (owner_id, title) dentro do bloco,
+    no INSERT ou no commit, no erro 400 de título duplicado. As demais
+    violações (ex.: chave estrangeira) são propagadas.
+    """
+    try:
+        yield
+    except IntegrityError as error:
+        db.rollback()
+        if not is_duplicate_title(error):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=DUPLICATE_TITLE_DETAIL,
+        )
+
+
+def commit_or_reject_duplicate_title(db: Session) -> None:
+    """
+    Confirma a transação, convertendo a violação do índice único
+    (owner_id, title) no erro 400 de título duplicado.
+    """
+    with rejecting_duplicate_title(db):
+        db.commit()
+
+
+def insert_shares(db: Session, task_id: int, user_ids) -> set:
+    """
+    Compartilha a tarefa com os usuários informados e retorna os IDs dos que
+    passaram a ter acesso. Compartilhamentos já existentes, inclusive os
+    gravados por uma requisição concorrente, são ignorados pelo banco.
+    """
+    if not user_ids:
+        return set()
+    return set(
+        db.scalars(
+            sqlite_insert(task_shares)
+            .on_conflict_do_nothing()
+            .returning(task_shares.c.user_id),
+            [{"task_id": task_id, "user_id": user_id} for user_id in user_ids],
+        )
+    )
+
+
+def touch_task_lists(db: Session, user_ids=(), task_ids=()) -> None:
+    """
+    Incrementa a versão da listagem dos usuários informados e dos que veem
+    as tarefas informadas (dono e compartilhados), na transação corrente.
+    Deve ser chamada antes de excluir as tarefas ou seus compartilhamentos.
+    """
+    conditions = []
+    if user_ids:
+        conditions.append(User.id.in_(user_ids))
+    if task_ids:
+        conditions.append(
+            User.id.in_(select(Task.owner_id).where(Task.id.in_(task_ids)))
+        )
+        conditions.append(
+            User.id.in_(
+                select(task_shares.c.user_id).where(task_shares.c.task_id.in_(task_ids))
+            )
+        )
+    db.execute(
+        update(User)
+        .where(or_(*conditions))
+        .values(task_list_version=User.task_list_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def task_list_version(db: Session, user_id: int) -> int:
+    """
+    Versão atual da listagem do usuário, lida do banco (sem ler as tarefas).
+    """
+    return db.query(User.task_list_version).filter(User.id == user_id).scalar()
+
+
+def find_duplicate_titles(
+    db: Session, owner_id: int, tasks: List[TaskCreate]
+) -> List[bool]:
+    """
+    Indica, para cada tarefa, se o título já pertence ao usuário ou se
+    repete dentro da própria lista, com uma única consulta ao banco.
+    """
+    titles = {task.title for task in tasks}
+    taken_titles = {
+        title
+        for (title,) in db.query(Task.title).filter(
+            Task.owner_id == owner_id, Task.title.in_(titles)
+        )
+    }
+
+    duplicates = []
+    for task in tasks:
+        duplicates.append(task.title in taken_titles)
+        taken_titles.add(task.title)
+    return duplicates
+
+
+def new_task_row(task: TaskCreate, owner_id: int) -> dict:
+    """
+    Valores de uma nova tarefa para inserção em lote.
+    """
+    return {
+        "title": task.title,
+        "description": task.description,
+        "is_completed": False,
+        "owner_id": owner_id,
+    }
+
+
+def parse_import_rows(text, import_format: str):
+    """
+    Lê o arquivo de importação registro a registro, gerando
+    (linha, dados, erro) sem carregar o arquivo inteiro em memória.
+    """
+    if import_format == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            data = {"title": row.get("title"), "description": row.get("description")}
+            data["description"] = data["description"] or None
+            yield reader.line_num, data, None
+        return
+
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line), None
+        except json.JSONDecodeError:
+            yield line_number, None, "JSON inválido"
+
+
+def pending_tasks_filter(task_ids, owner_id: int):
+    """
+    Condições que restringem as tarefas às pendentes do usuário.
+    """
+    return (
+        Task.id.in_(task_ids),
+        Task.owner_id == owner_id,
+        Task.is_completed == False,
+    )
+
+
+def apply_to_pending_tasks(
+    db: Session, task_ids: List[int], owner_id: int, completed_detail: str, apply
+) -> List[TaskIdResult]:
+    """
+    Aplica uma operação em lote às tarefas pendentes do usuário, com as
+    mesmas regras dos endpoints individuais. `apply` recebe os IDs elegíveis
+    e retorna os IDs efetivamente alterados.
+    """
+    task_ids = list(dict.fromkeys(task_ids))
+    completed_by_id = dict(
+        db.query(Task.id, Task.is_completed).filter(
+            Task.id.in_(task_ids), Task.owner_id == owner_id
+        )
+    )
+    eligible_ids = [
+        task_id
+        for task_id in task_ids
+        if task_id in completed_by_id and not completed_by_id[task_id]
+    ]
+    changed_ids = set()
+    if eligible_ids:
+        touch_task_lists(db, task_ids=eligible_ids)
+        changed_ids = set(apply(eligible_ids))
+    db.commit()
+
+    results = []
+    for task_id in task_ids:
+        if task_id not in completed_by_id:
+            status_code, detail = status.HTTP_404_NOT_FOUND, TASK_NOT_FOUND_DETAIL
+        elif completed_by_id[task_id]:
+            status_code, detail = status.HTTP_400_BAD_REQUEST, completed_detail
+        elif task_id not in changed_ids:
+            status_code, detail = status.HTTP_409_CONFLICT, TASK_CONFLICT_DETAIL
+        else:
+            status_code, detail = status.HTTP_200_OK, None
+        results.append(TaskIdResult(id=task_id, status_code=status_code, detail=detail))
+    return results
+
+
+def visible_to(user_id: int):
+    """
+    Condição das tarefas visíveis ao usuário: as próprias e as compartilhadas.
+    O SQLite a resolve com os índices por dono e por destinatário (MULTI-INDEX
+    OR), lendo apenas as tarefas do usuário, e não a tabela inteira.
+    """
+    shared = select(task_shares.c.task_id).where(task_shares.c.user_id == user_id)
+    return or_(Task.owner_id == user_id, Task.id.in_(shared))
+
+
+def task_status_condition(task_status: Optional[str]):
+    """
+    Converte o filtro de status da listagem em condição SQL.
+    """
+    if not task_status:
+        return None
+    if task_status.lower() == "concluídas":
+        return Task.is_completed == True
+    if task_status.lower() == "pendentes":
+        return Task.is_completed == False
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Status inválido. Use 'concluídas' ou 'pendentes'.",
+    )
+
+
+def format_export_rows(rows, export_format: str) -> str:
+    """
+    Formata um bloco de linhas da exportação como NDJSON ou CSV.
+    """
+    if export_format == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
+
+    keys = [column.key for column in EXPORT_COLUMNS]
+    return "".join(
+        json.dumps(dict(zip(keys, row)), default=datetime.isoformat) + "\n"
+        for row in rows
+    )
+
+
+def stream_tasks(bind, user_id: int, condition, export_format: str):
+    """
+    Gera a exportação em blocos, lendo as tarefas com um cursor no servidor.
+    Usa uma sessão própria, pois a sessão da requisição é fechada antes do envio.
+    """
+    if export_format == "csv":
+        yield format_export_rows([[c.key for c in EXPORT_COLUMNS]], export_format)
+
+    with Session(bind=bind) as session:
+        query = session.query(*EXPORT_COLUMNS).filter(visible_to(user_id))
+        if condition is not None:
+            query = query.filter(condition)
+
+        chunk = []
+        for row in query.order_by(Task.id).yield_per(EXPORT_CHUNK_SIZE):
+            chunk.append(row)
+            if len(chunk) == EXPORT_CHUNK_SIZE:
+                yield format_export_rows(chunk, export_format)
+                chunk = []
+        if chunk:
+            yield format_export_rows(chunk, export_format)
+
+
 # Endpoints
 
 
@@ -52,27 +515,121 @@ def create_task(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    existing_task = (
-        db.query(Task)
-        .filter(Task.title == task.title, Task.owner_id == current_user.id)
-        .first()
-    )
-    if existing_task:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Você já possui uma tarefa com este título",
-        )
-
     new_task = Task(
         title=task.title, description=task.description, owner_id=current_user.id
     )
+    touch_task_lists(db, user_ids=[current_user.id])
     db.add(new_task)
-    db.commit()
+    commit_or_reject_duplicate_title(db)
     db.refresh(new_task)
 
     return new_task
 
 
+@router.post(
+    "/batch", response_model=List[TaskBatchResult], status_code=status.HTTP_200_OK
+)
+def create_tasks_batch(
+    batch: TaskBatchCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    duplicates = find_duplicate_titles(db, current_user.id, batch.tasks)
+
+    results = []
+    rows = []
+    for index, (task, duplicate) in enumerate(zip(batch.tasks, duplicates)):
+        if duplicate:
+            results.append(
+                TaskBatchResult(
+                    index=index,
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=DUPLICATE_TITLE_DETAIL,
+                )
+            )
+            continue
+        rows.append(new_task_row(task, current_user.id))
+        results.append(
+            TaskBatchResult(index=index, status_code=status.HTTP_201_CREATED)
+        )
+
+    if rows:
+        # Um único INSERT para o lote; o SQLite não garante a ordem do
+        # RETURNING, então as tarefas criadas são associadas pelo título,
+        # único entre as linhas inseridas
+        # Outra requisição pode ter criado um dos títulos após a verificação
+        with rejecting_duplicate_title(db):
+            new_tasks = db.scalars(insert(Task).returning(Task), rows).all()
+        touch_task_lists(db, user_ids=[current_user.id])
+        # Serializa antes do commit, que expiraria os objetos retornados
+        created = {
+            new_task.title: TaskResponse.model_validate(new_task, from_attributes=True)
+            for new_task in new_tasks
+        }
+        for result in results:
+            if result.status_code == status.HTTP_201_CREATED:
+                result.task = created[batch.tasks[result.index].title]
+        commit_or_reject_duplicate_title(db)
+
+    return results
+
+
+@router.patch(
+    "/batch/complete",
+    response_model=List[TaskIdResult],
+    status_code=status.HTTP_200_OK,
+)
+def complete_tasks_batch(
+    batch: TaskIds,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    def complete(task_ids):
+        return db.scalars(
+            update(Task)
+            .where(*pending_tasks_filter(task_ids, current_user.id))
+            .values(is_completed=True, completion_date=datetime.utcnow())
+            .returning(Task.id)
+        )
+
+    return apply_to_pending_tasks(
+        db, batch.ids, current_user.id, "Tarefa já está concluída", complete
+    )
+
+
+@router.post(
+    "/batch/delete",
+    response_model=List[TaskIdResult],
+    status_code=status.HTTP_200_OK,
+)
+def delete_tasks_batch(
+    batch: TaskIds,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    def remove(task_ids):
+        # Compartilhamentos primeiro, restritos às tarefas ainda elegíveis
+        pending_ids = (
+            db.query(Task.id)
+            .filter(*pending_tasks_filter(task_ids, current_user.id))
+            .scalar_subquery()
+        )
+        db.execute(delete(task_shares).where(task_shares.c.task_id.in_(pending_ids)))
+        return db.scalars(
+            delete(Task)
+            .where(*pending_tasks_filter(task_ids, current_user.id))
+            .returning(Task.id)
+        )
+
+    return apply_to_pending_tasks(
+        db,
+        batch.ids,
+        current_user.id,
+        "Tarefas concluídas não podem ser excluídas",
+        remove,
+    )
+
+
 @router.put("/{task_id}", response_model=TaskResponse, status_code=status.HTTP_200_OK)
 def update_task(
     task_id: int,
@@ -97,22 +654,11 @@ def update_task(
             detail="Tarefas concluídas não podem ser editadas",
         )
 
-    if task.title and task.title != existing_task.title:
-        duplicate_task = (
-            db.query(Task)
-            .filter(Task.title == task.title, Task.owner_id == current_user.id)
-            .first()
-        )
-        if duplicate_task:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Você já possui uma tarefa com este título",
-            )
-
+    touch_task_lists(db, task_ids=[task_id])
     for key, value in task.dict(exclude_unset=True).items():
         setattr(existing_task, key, value)
 
-    db.commit()
+    commit_or_reject_duplicate_title(db)
     db.refresh(existing_task)
 
     return existing_task
@@ -141,6 +687,7 @@ def delete_task(
             detail="Tarefas concluídas não podem ser excluídas",
         )
 
+    touch_task_lists(db, task_ids=[task_id])
     db.delete(task)
     db.commit()
 
@@ -174,36 +721,358 @@ def complete_task(
 
     task.is_completed = True
     task.completion_date = datetime.utcnow()
+    touch_task_lists(db, task_ids=[task_id])
     db.commit()
     db.refresh(task)
 
     return task
 
 
+def parse_task_fields(fields: Optional[str]) -> tuple:
+    """
+    Converte o parâmetro `fields` ("id,title") nos campos da resposta, na
+    ordem do schema. Sem o parâmetro, retorna todos os campos.
+    """
+    if fields is None:
+        return TASK_RESPONSE_FIELDS
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    invalid = requested - set(TASK_RESPONSE_FIELDS)
+    if not requested or invalid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Campos inválidos: {', '.join(sorted(invalid)) or fields}",
+        )
+    return tuple(field for field in TASK_RESPONSE_FIELDS if field in requested)
+
+
+def task_columns(fields: tuple, sort_by: str) -> tuple:
+    """
+    Colunas a selecionar para os campos pedidos. O ID e a chave de ordenação,
+    necessários ao cursor, vêm ao final e são descartados na serialização.
+    """
+    extra = [key for key in dict.fromkeys(("id", sort_by)) if key not in fields]
+    return tuple(getattr(Task, field) for field in (*fields, *extra))
+
+
+def serialize_tasks(tasks: list, fields: tuple = TASK_RESPONSE_FIELDS) -> bytes:
+    """
+    Serializa a listagem em JSON com o mesmo resultado do response_model.
+    Linhas de `task_columns` vão direto ao encoder do pydantic-core, sem
+    validação nem instâncias de TaskResponse, mantendo apenas `fields`;
+    entidades passam pelo TypeAdapter pré-compilado.
+    """
+    if tasks and not isinstance(tasks[0], Task):
+        return to_json([dict(zip(fields, row)) for row in tasks])
+    return TASK_LIST_ADAPTER.dump_json(
+        TASK_LIST_ADAPTER.validate_python(tasks, from_attributes=True)
+    )
+
+
+def query_task_page(
+    db: Session,
+    user_id: int,
+    task_status: Optional[str],
+    limit: Optional[int],
+    cursor: Optional[str],
+    sort_by: str,
+    columns: tuple = (Task,),
+):
+    """
+    Consulta as tarefas visíveis ao usuário e retorna a página solicitada
+    junto ao cursor da próxima página (None se for a última). Por padrão
+    retorna entidades; com `columns`, linhas apenas com as colunas pedidas.
+    """
+    query = db.query(*columns).filter(visible_to(user_id))
+
+    condition = task_status_condition(task_status)
+    if condition is not None:
+        query = query.filter(condition)
+
+    # Sem paginação, mantém o comportamento original de retornar tudo, na
+    # ordem de criação (o plano com dois índices não a garante sozinho)
+    if limit is None and cursor is None:
+        return sorted(query.all(), key=lambda task: task.id), None
+
+    sort_column = TASK_SORT_KEYS[sort_by]
+    if cursor:
+        last_value, last_id = decode_cursor(cursor, sort_by)
+        if sort_by == "id":
+            query = query.filter(Task.id > last_id)
+        else:
+            query = query.filter(
+                tuple_(sort_column, Task.id) > tuple_(last_value, last_id)
+            )
+
+    # Busca um registro a mais para saber se existe uma próxima página
+    page_size = limit or DEFAULT_PAGE_SIZE
+    tasks = query.order_by(sort_column, Task.id).limit(page_size + 1).all()
+    if len(tasks) > page_size:
+        tasks = tasks[:page_size]
+        return tasks, encode_cursor(sort_by, tasks[-1])
+    return tasks, None
+
+
 @router.get("/", response_model=List[TaskResponse], status_code=status.HTTP_200_OK)
 def list_tasks(
     task_status: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
+    limit: Annotated[Optional[int], Query(ge=1, le=MAX_PAGE_SIZE)] = None,
+    cursor: Optional[str] = None,
+    sort_by: Literal["id", "title"] = "id",
+    response: Response = None,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+    fields: Optional[str] = None,
 ):
-    query = db.query(Task).filter(
-        (Task.owner_id == current_user.id)
-        | (Task.shared_with_users.any(id=current_user.id))
+    # Chamada direta (fora de uma requisição HTTP): retorna as entidades
+    if response is None:
+        tasks, _ = query_task_page(
+            db, current_user.id, task_status, limit, cursor, sort_by
+        )
+        return tasks
+
+    # Projeção: apenas os campos pedidos são lidos do banco e serializados
+    selected = parse_task_fields(fields)
+
+    # A versão é lida na mesma transação que as tarefas: a resposta guardada
+    # com ela corresponde exatamente a essa versão, em qualquer worker
+    version = task_list_version(db, current_user.id)
+
+    # ETag derivado da versão da listagem; se o cliente já tem a versão
+    # atual, responde 304 sem consultar o cache nem as tarefas
+    etag = f'"{current_user.id}-{version}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    cache_key = json.dumps(
+        [task_status and task_status.lower(), limit, cursor, sort_by, selected]
     )
+    cached = task_list_cache.get(current_user.id, version, cache_key)
+    if cached is None:
+        columns = (Task,)
+        if fields is not None or settings.task_serialization == "rows":
+            columns = task_columns(selected, sort_by)
+        tasks, next_cursor = query_task_page(
+            db, current_user.id, task_status, limit, cursor, sort_by, columns
+        )
+        with phase("serialize"):
+            body = serialize_tasks(tasks, selected).decode()
+        cached = {"next_cursor": next_cursor, "body": body}
+        task_list_cache.set(current_user.id, version, cache_key, cached)
 
-    if task_status:
-        if task_status.lower() == "concluídas":
-            query = query.filter(Task.is_completed == True)
-        elif task_status.lower() == "pendentes":
-            query = query.filter(Task.is_completed == False)
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Status inválido. Use 'concluídas' ou 'pendentes'.",
-            )
+    if cached["next_cursor"]:
+        headers[NEXT_CURSOR_HEADER] = cached["next_cursor"]
+    return Response(
+        content=cached["body"], media_type="application/json", headers=headers
+    )
 
-    tasks = query.all()
-    return tasks
+
+def summarize_tasks(db: Session, user_id: int) -> dict:
+    """
+    Conta as tarefas visíveis ao usuário por status e por origem (próprias
+    ou compartilhadas com ele) em uma única consulta agrupada.
+    """
+    owned = select(literal("owned").label("origin"), Task.is_completed).where(
+        Task.owner_id == user_id
+    )
+    shared = (
+        select(literal("shared").label("origin"), Task.is_completed)
+        .join(task_shares, task_shares.c.task_id == Task.id)
+        .where(task_shares.c.user_id == user_id, Task.owner_id != user_id)
+    )
+    visible = union_all(owned, shared).subquery()
+    rows = db.execute(
+        select(visible.c.origin, visible.c.is_completed, func.count()).group_by(
+            visible.c.origin, visible.c.is_completed
+        )
+    ).all()
+
+    summary = TaskSummary(owned=TaskCounts(), shared=TaskCounts())
+    for origin, is_completed, count in rows:
+        key = "completed" if is_completed else "pending"
+        for counts in (summary, getattr(summary, origin)):
+            counts.total += count
+            setattr(counts, key, getattr(counts, key) + count)
+    return summary.model_dump()
+
+
+@router.get("/summary", response_model=TaskSummary, status_code=status.HTTP_200_OK)
+def task_summary(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    # Compartilha o cache (e a versão) da listagem do usuário
+    version = task_list_version(db, current_user.id)
+    summary = task_list_cache.get(current_user.id, version, "summary")
+    if summary is None:
+        summary = summarize_tasks(db, current_user.id)
+        task_list_cache.set(current_user.id, version, "summary", summary)
+    return summary
+
+
+def task_search_query(text: str) -> Optional[str]:
+    """
+    Converte o texto digitado em uma consulta FTS5 em que cada palavra é
+    buscada por prefixo. As palavras vão entre aspas, de modo que operadores
+    e pontuação do usuário não são interpretados como sintaxe do FTS5.
+    """
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+@router.get(
+    "/search", response_model=List[TaskResponse], status_code=status.HTTP_200_OK
+)
+def search_tasks(
+    q: Annotated[str, Query(min_length=1, max_length=MAX_SEARCH_LENGTH)],
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+):
+    match = task_search_query(q)
+    if match is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Informe ao menos uma palavra para a busca",
+        )
+
+    # O MATCH no índice FTS5 seleciona e ordena as ocorrências de todos os
+    # usuários; a visibilidade (próprias e compartilhadas) é aplicada sobre
+    # elas. O custo acompanha o total de ocorrências do termo, não a
+    # quantidade de tarefas do usuário: o FTS5 não restringe um MATCH por
+    # prefixo a um conjunto de rowids sem reavaliá-lo linha a linha.
+    query = (
+        db.query(*task_columns(TASK_RESPONSE_FIELDS, "id"), task_search.c.rank)
+        .join(task_search, task_search.c.rowid == Task.id)
+        .filter(literal_column(TASK_SEARCH_TABLE).op("MATCH")(match))
+        .filter(visible_to(current_user.id))
+    )
+    if cursor:
+        last_rank, last_id = decode_cursor(cursor, "rank")
+        query = query.filter(
+            tuple_(task_search.c.rank, Task.id) > tuple_(last_rank, last_id)
+        )
+
+    # Mais relevantes primeiro; um registro a mais indica a próxima página
+    tasks = query.order_by(task_search.c.rank, Task.id).limit(limit + 1).all()
+    headers = {}
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor("rank", tasks[-1])
+
+    with phase("serialize"):
+        body = serialize_tasks(tasks)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/export", status_code=status.HTTP_200_OK)
+@keep_sync
+def export_tasks(
+    task_status: Optional[str] = None,
+    export_format: Annotated[
+        Literal["ndjson", "csv"], Query(alias="format")
+    ] = "ndjson",
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    condition = task_status_condition(task_status)
+    return StreamingResponse(
+        stream_tasks(db.get_bind(), current_user.id, condition, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="tasks.{export_format}"'
+        },
+    )
+
+
+@router.post("/import", response_model=TaskImportResult, status_code=status.HTTP_200_OK)
+@keep_sync
+def import_tasks(
+    file: UploadFile,
+    import_format: Annotated[
+        Literal["ndjson", "csv"], Query(alias="format")
+    ] = "ndjson",
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    result = TaskImportResult(processed=0, created=0, failed=0, errors=[])
+
+    def reject(line: int, detail: str) -> None:
+        result.failed += 1
+        if len(result.errors) < MAX_IMPORT_ERRORS:
+            result.errors.append(TaskImportError(line=line, detail=detail))
+
+    def flush(chunk: list, retry: bool = True) -> None:
+        tasks = [task for _, task in chunk]
+        duplicates = find_duplicate_titles(db, current_user.id, tasks)
+        rows = [
+            new_task_row(task, current_user.id)
+            for task, duplicate in zip(tasks, duplicates)
+            if not duplicate
+        ]
+        if rows:
+            try:
+                db.execute(insert(Task), rows)
+                touch_task_lists(db, user_ids=[current_user.id])
+                db.commit()
+            except IntegrityError as error:
+                # Um título foi criado por outra requisição após a verificação:
+                # desfaz o bloco e o verifica de novo uma vez; se o conflito
+                # persistir, as linhas do bloco são registradas como erros
+                db.rollback()
+                if not is_duplicate_title(error):
+                    raise
+                if retry:
+                    flush(chunk, retry=False)
+                else:
+                    for line, _ in chunk:
+                        reject(line, IMPORT_CONFLICT_DETAIL)
+                return
+            result.created += len(rows)
+        for (line, _), duplicate in zip(chunk, duplicates):
+            if duplicate:
+                reject(line, DUPLICATE_TITLE_DETAIL)
+        logger.info(
+            "Importação do usuário %s: %d registros processados, %d tarefas criadas",
+            current_user.id,
+            result.processed,
+            result.created,
+        )
+
+    text = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+    chunk = []
+    try:
+        for line, data, error in parse_import_rows(text, import_format):
+            result.processed += 1
+            if error is None:
+                try:
+                    chunk.append((line, TaskCreate.model_validate(data)))
+                except ValidationError as exc:
+                    error = "; ".join(
+                        f"{'.'.join(map(str, e['loc']))}: {e['msg']}"
+                        for e in exc.errors()
+                    )
+            if error is not None:
+                reject(line, error)
+            if len(chunk) == IMPORT_CHUNK_SIZE:
+                flush(chunk)
+                chunk = []
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="O arquivo deve estar codificado em UTF-8",
+        )
+    finally:
+        text.detach()
+
+    if chunk:
+        flush(chunk)
+
+    return result
 
 
 @router.post("/{task_id}/share", response_model=dict, status_code=status.HTTP_200_OK)
@@ -221,23 +1090,73 @@ def share_task(
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Tarefa não encontrada ou você não tem permissão para compartilhá-la",
+            detail=SHARE_TASK_NOT_FOUND_DETAIL,
         )
 
     user_to_share = db.query(User).filter(User.email == share.user_email).first()
     if not user_to_share:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Usuário para compartilhamento não encontrado",
+            detail=SHARE_USER_NOT_FOUND_DETAIL,
         )
 
-    if user_to_share in task.shared_with_users:
+    if not insert_shares(db, task.id, [user_to_share.id]):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Tarefa já está compartilhada com este usuário",
+            detail=ALREADY_SHARED_DETAIL,
         )
 
-    task.shared_with_users.append(user_to_share)
+    touch_task_lists(db, user_ids=[current_user.id, user_to_share.id])
     db.commit()
 
     return {"msg": f"Tarefa compartilhada com {share.user_email}"}
+
+
+@router.post(
+    "/{task_id}/share/batch",
+    response_model=List[ShareResult],
+    status_code=status.HTTP_200_OK,
+)
+def share_task_batch(
+    task_id: int,
+    share: ShareTaskBatch,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    owns_task = (
+        db.query(Task.id)
+        .filter(Task.id == task_id, Task.owner_id == current_user.id)
+        .first()
+    )
+    if not owns_task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=SHARE_TASK_NOT_FOUND_DETAIL,
+        )
+
+    # Uma consulta para os usuários e uma inserção para os compartilhamentos;
+    # quem já tinha acesso não é retornado pela inserção
+    emails = list(dict.fromkeys(share.user_emails))
+    user_ids_by_email = dict(
+        db.query(User.email, User.id).filter(User.email.in_(emails))
+    )
+    inserted_user_ids = insert_shares(db, task_id, list(user_ids_by_email.values()))
+
+    results = []
+    for email in emails:
+        user_id = user_ids_by_email.get(email)
+        if user_id is None:
+            status_code, detail = status.HTTP_404_NOT_FOUND, SHARE_USER_NOT_FOUND_DETAIL
+        elif user_id not in inserted_user_ids:
+            status_code, detail = status.HTTP_400_BAD_REQUEST, ALREADY_SHARED_DETAIL
+        else:
+            status_code, detail = status.HTTP_200_OK, None
+        results.append(
+            ShareResult(user_email=email, status_code=status_code, detail=detail)
+        )
+
+    if inserted_user_ids:
+        touch_task_lists(db, user_ids=[current_user.id, *inserted_user_ids])
+        db.commit()
+
+    return results
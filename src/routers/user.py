@@ -1,11 +1,26 @@
 # src/routers/user.py
 
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import BaseModel, EmailStr, constr
 from sqlalchemy.orm import Session
 
-from auth import authenticate_user, create_access_token, get_password_hash
+from auth import (
+    authenticate_user,
+    commit_revocations,
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+    get_current_user,
+    get_password_hash,
+    oauth2_scheme,
+    revoke_token,
+    revoke_user_tokens,
+    rotate_refresh_token,
+    token_claims,
+)
 from database import User, get_db
 
 router = APIRouter(
@@ -28,9 +43,22 @@ class UserLogin(BaseModel):
 
 class Token(BaseModel):
     access_token: str
+    refresh_token: str
     token_type: str
 
 
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
+def issue_tokens(user: User) -> dict:
+    return {
+        "access_token": create_access_token(data=token_claims(user)),
+        "refresh_token": create_refresh_token(user),
+        "token_type": "bearer",
+    }
+
+
 # Endpoints
 
 
@@ -64,6 +92,44 @@ def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    access_token = create_access_token(data={"sub": authenticated_user.email})
+    return issue_tokens(authenticated_user)
 
-    return {"access_token": access_token, "token_type": "bearer"}
+
+@router.post("/refresh", response_model=Token, status_code=status.HTTP_200_OK)
+def refresh(request: RefreshRequest, db: Session = Depends(get_db)):
+    # O refresh token usado é revogado: cada um vale para uma única renovação
+    user = rotate_refresh_token(request.refresh_token, db)
+    tokens = issue_tokens(user)
+    commit_revocations(db)
+    return tokens
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(
+    request: Optional[RefreshRequest] = None,
+    token: str = Depends(oauth2_scheme),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    # Todos os tokens são validados antes que qualquer um seja revogado
+    payloads = [decode_token(token, db)]
+    if request is not None:
+        payload = decode_token(request.refresh_token, db)
+        if payload.get("typ") != "refresh" or payload.get("uid") != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Refresh token inválido",
+            )
+        payloads.append(payload)
+    for payload in payloads:
+        revoke_token(payload, db)
+    commit_revocations(db)
+
+
+@router.post("/logout/all", status_code=status.HTTP_204_NO_CONTENT)
+def logout_all(
+    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+):
+    # O novo carimbo de segurança invalida todos os tokens já emitidos
+    revoke_user_tokens(db.get(User, current_user.id))
+    db.commit()
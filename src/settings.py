@@ -0,0 +1,117 @@
+# src/settings.py
+
+import os
+
+from typing import Literal, Optional, get_args
+
+from pydantic import BaseModel
+
+
+class Settings(BaseModel):
+    """
+    Configurações da aplicação. Cada campo pode ser sobrescrito pela
+    variável de ambiente de mesmo nome em maiúsculas (ex.: DATABASE_URL).
+    """
+
+    database_url: str = "sqlite:///./tasks.db"
+
+    # Modo assíncrono: endpoints async sobre um engine assíncrono (aiosqlite).
+    # Sem async_database_url, usa o mesmo banco de database_url
+    database_async: bool = False
+    async_database_url: Optional[str] = None
+
+    # Aplica as migrações na inicialização da aplicação. Desativado, o
+    # esquema só é alterado por `make migrate` (python src/migrate.py)
+    migrate_on_startup: bool = False
+
+    # Pool de conexões (sem pool_class, usa o padrão do SQLAlchemy)
+    database_pool_class: Optional[Literal["queue", "null", "static", "singleton"]] = (
+        None
+    )
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout: float = 30.0
+
+    # PRAGMAs aplicados a cada nova conexão SQLite (vazio ou None desativa o
+    # PRAGMA; nas variáveis de ambiente, um valor vazio)
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_mmap_size: Optional[int] = 268435456
+    sqlite_cache_size: Optional[int] = -65536
+    sqlite_busy_timeout: Optional[int] = 5000
+    sqlite_foreign_keys: Optional[bool] = True
+
+    # Tokens com o ID e o carimbo de segurança do usuário nas claims: as
+    # rotas recebem a identidade sem consultar o banco (o User completo é
+    # carregado sob demanda). Desativado, o usuário é buscado pelo e-mail
+    auth_stateless_tokens: bool = True
+
+    # Validade dos tokens. Com a lista de revogação, o token de acesso pode
+    # durar mais; o refresh token renova o par sem repetir o login (bcrypt)
+    access_token_expire_minutes: int = 1440
+    refresh_token_expire_days: int = 30
+    # Intervalo (s) entre as leituras das revogações feitas por outros workers
+    token_revocation_sync_interval: float = 5.0
+
+    # Cache de usuários autenticados (tamanho 0 desativa)
+    user_cache_size: int = 10000
+    user_cache_ttl: float = 60.0
+
+    # Cache das respostas da listagem de tarefas. O backend "sqlite" grava
+    # em um arquivo local compartilhado entre os workers; "none" desativa.
+    # O tamanho limita a quantidade de entradas e `max_bytes` a soma delas.
+    task_list_cache_backend: Literal["none", "memory", "sqlite"] = "memory"
+    task_list_cache_size: int = 10000
+    task_list_cache_max_bytes: int = 64 * 1024 * 1024
+    task_list_cache_ttl: float = 30.0
+    task_list_cache_path: str = "./tasks-cache.db"
+
+    # Serialização da listagem de tarefas: "rows" lê apenas as colunas da
+    # resposta e as codifica direto em JSON; "orm" carrega as entidades
+    task_serialization: Literal["orm", "rows"] = "rows"
+
+    # Medição por requisição (fases, consultas SQL), enviada no cabeçalho
+    # Server-Timing e em uma linha de log; desativada não adiciona custo
+    request_timing: bool = False
+
+    # Endpoint /metrics (Prometheus). Com vários workers, defina um diretório
+    # compartilhado em que cada worker grava suas amostras periodicamente
+    metrics_enabled: bool = True
+    metrics_dir: Optional[str] = None
+    metrics_flush_interval: float = 5.0
+
+    # Pool de processos para o bcrypt (0 executa na thread da requisição)
+    password_workers: int = 0
+    password_max_pending: int = 64
+
+    def resolved_async_database_url(self) -> str:
+        """
+        URL do engine assíncrono: a configurada ou a de database_url com o
+        driver aiosqlite, para que as rotas síncronas e assíncronas usem o
+        mesmo banco.
+        """
+        if self.async_database_url:
+            return self.async_database_url
+        scheme, separator, rest = self.database_url.partition("://")
+        if scheme in ("sqlite", "sqlite+pysqlite"):
+            return f"sqlite+aiosqlite{separator}{rest}"
+        return self.database_url
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """
+        Carrega as configurações a partir das variáveis de ambiente. Um valor
+        vazio em um campo opcional equivale a None (ex.: SQLITE_MMAP_SIZE=).
+        """
+        values = {}
+        for name, field in cls.model_fields.items():
+            value = os.environ.get(name.upper())
+            if value is None:
+                continue
+            if value == "" and type(None) in get_args(field.annotation):
+                value = None
+            values[name] = value
+        return cls(**values)
+
+
+settings = Settings.from_env()
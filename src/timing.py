@@ -0,0 +1,153 @@
+# src/timing.py
+
+import json
+import logging
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# Medições da requisição em andamento (None fora de requisições medidas)
+_current: ContextVar[Optional["RequestTimings"]] = ContextVar(
+    "request_timings", default=None
+)
+_NO_PHASE = nullcontext()
+
+
+class RequestTimings:
+    """
+    Durações por fase e consultas SQL de uma requisição. O objeto é
+    compartilhado (por referência) com as threads que atendem a requisição.
+    """
+
+    def __init__(self):
+        self.phases: dict = {}
+        self.sql_count = 0
+        self.sql_time = 0.0
+
+    def add(self, name: str, duration: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + duration
+
+    def server_timing(self, total: float) -> str:
+        """
+        Valor do cabeçalho Server-Timing (durações em milissegundos).
+        """
+        metrics = [
+            f"{name};dur={duration * 1000:.3f}"
+            for name, duration in self.phases.items()
+        ]
+        metrics.append(
+            f'db;dur={self.sql_time * 1000:.3f};desc="{self.sql_count} queries"'
+        )
+        metrics.append(f"total;dur={total * 1000:.3f}")
+        return ", ".join(metrics)
+
+
+class _Phase:
+    __slots__ = ("timings", "name", "started")
+
+    def __init__(self, timings: RequestTimings, name: str):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.timings.add(self.name, time.perf_counter() - self.started)
+
+
+def phase(name: str):
+    """
+    Mede um trecho da requisição atual como a fase `name`. Fora de uma
+    requisição medida (ou com a medição desativada) não faz nada.
+    """
+    timings = _current.get()
+    if timings is None:
+        return _NO_PHASE
+    return _Phase(timings, name)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timings = _current.get()
+    started = conn.info.get("query_started")
+    if timings is None or not started:
+        return
+    timings.sql_count += 1
+    timings.sql_time += time.perf_counter() - started.pop()
+
+
+def instrument_engine(engine) -> None:
+    """
+    Contabiliza as consultas do engine na requisição em que são executadas.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def uninstrument_engine(engine) -> None:
+    event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+    event.remove(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class RequestTimingMiddleware:
+    """
+    Middleware ASGI que mede cada requisição HTTP: adiciona o cabeçalho
+    Server-Timing à resposta e registra uma linha de log estruturada (JSON)
+    ao final, incluindo o que for executado durante o envio do corpo.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        started = time.perf_counter()
+        status_code = None
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                header = timings.server_timing(time.perf_counter() - started)
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", header.encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            total = time.perf_counter() - started
+            _current.reset(token)
+            logger.info(
+                json.dumps(
+                    {
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status": status_code,
+                        "duration_ms": round(total * 1000, 3),
+                        "phases_ms": {
+                            name: round(duration * 1000, 3)
+                            for name, duration in timings.phases.items()
+                        },
+                        "sql_count": timings.sql_count,
+                        "sql_ms": round(timings.sql_time * 1000, 3),
+                    }
+                )
+            )
@@ -1,21 +1,40 @@
 # tests/felipe/conftest.py
 
+from collections import Counter
+from contextlib import contextmanager
 from unittest import mock
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
+from auth import revoked_tokens, user_cache
+from routers.task import task_list_cache
 from database import Base, get_db
-from main import app
+from main import create_app
+from settings import Settings
 
 DATABASE_URL = "sqlite:///:memory:"
 
+# Aplicação de testes: não usa as variáveis de ambiente nem o tasks.db local
+app = create_app(Settings(database_url=DATABASE_URL))
+
 
 @pytest.fixture(scope="session")
 def engine():
     engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+
+    # O pysqlite gerencia transações por conta própria e quebra SAVEPOINTs;
+    # desativa esse controle para que o SQLAlchemy emita o BEGIN.
+    @event.listens_for(engine, "connect")
+    def disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def emit_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
     Base.metadata.create_all(bind=engine)
     yield engine
     Base.metadata.drop_all(bind=engine)
@@ -26,8 +45,14 @@ def db_session(engine):
     """Cria uma sessão de banco de dados para um teste."""
     connection = engine.connect()
     transaction = connection.begin()
-    Session = sessionmaker(bind=connection)
+    # Cada commit/rollback da aplicação atua em um SAVEPOINT, preservando
+    # a transação externa que é desfeita ao final do teste
+    Session = sessionmaker(bind=connection, join_transaction_mode="create_savepoint")
     session = Session()
+    # Tokens em cache de testes anteriores apontariam para usuários desfeitos
+    user_cache.clear()
+    revoked_tokens.clear()
+    task_list_cache.clear()
 
     yield session
 
@@ -84,3 +109,113 @@ def mocker_fixture():
     mocker = MockerFixture()
     yield mocker
     mocker.stop_all()  # Finaliza todos os patches ao final do teste
+
+
+class QueryCounter:
+    """
+    Registra as consultas SQL executadas no engine de testes, ignorando os
+    comandos de controle de transação (BEGIN, SAVEPOINT, ...) dos fixtures.
+    """
+
+    IGNORED_PREFIXES = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE")
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith(self.IGNORED_PREFIXES):
+            self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated(self, max_repeats: int) -> dict:
+        """
+        Consultas idênticas executadas mais de `max_repeats` vezes, o padrão
+        de um N+1 (uma consulta por item em vez de uma para todos).
+        """
+        return {
+            statement: times
+            for statement, times in Counter(self.statements).items()
+            if times > max_repeats
+        }
+
+    def report(self) -> str:
+        return "\n".join(
+            f"  {number}. {' '.join(statement.split())}"
+            for number, statement in enumerate(self.statements, start=1)
+        )
+
+
+@pytest.fixture
+def count_queries(engine):
+    """
+    Context manager que conta as consultas executadas dentro do bloco.
+    """
+
+    @contextmanager
+    def counting():
+        counter = QueryCounter()
+        event.listen(engine, "before_cursor_execute", counter)
+        try:
+            yield counter
+        finally:
+            event.remove(engine, "before_cursor_execute", counter)
+
+    return counting
+
+
+@pytest.fixture
+def query_budget(count_queries):
+    """
+    Context manager que falha o teste se o bloco executar mais consultas que
+    o orçamento ou repetir uma mesma consulta mais de `max_repeats` vezes.
+    """
+
+    @contextmanager
+    def budget(max_queries: int, max_repeats: int = 2):
+        with count_queries() as counter:
+            yield counter
+
+        assert counter.count <= max_queries, (
+            f"{counter.count} consultas executadas; orçamento: {max_queries}\n"
+            f"{counter.report()}"
+        )
+        repeated = counter.repeated(max_repeats)
+        assert not repeated, (
+            "Consultas repetidas (possível N+1):\n"
+            + "\n".join(
+                f"  {times}x {statement}" for statement, times in repeated.items()
+            )
+            + f"\n{counter.report()}"
+        )
+
+    return budget
+
+
+@pytest.fixture
+def query_plans(engine):
+    """
+    Context manager que registra o plano (EXPLAIN QUERY PLAN) de cada SELECT
+    executado dentro do bloco, como um texto por consulta.
+    """
+
+    @contextmanager
+    def explaining():
+        plans = []
+
+        def explain(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                rows = cursor.connection.execute(
+                    f"EXPLAIN QUERY PLAN {statement}", parameters
+                ).fetchall()
+                plans.append(" | ".join(row[-1] for row in rows))
+
+        event.listen(engine, "before_cursor_execute", explain)
+        try:
+            yield plans
+        finally:
+            event.remove(engine, "before_cursor_execute", explain)
+
+    return explaining
@@ -0,0 +1,151 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from auth import (
+    create_access_token,
+    create_refresh_token,
+    get_password_hash,
+    token_claims,
+)
+from database import Task, User
+
+PASSWORD = "Senha123"
+
+# Orçamento de consultas por endpoint, medido em uma única requisição com os
+# caches vazios. Uma mudança que adicione consultas a um endpoint deve
+# ajustar o orçamento de forma consciente. Os lotes têm 3 itens para que
+# uma consulta por item (N+1) exceda o limite de repetições.
+BATCH_IDS = ["{pending}", "{other}", "{received}"]
+QUERY_BUDGETS = [
+    ("GET", "/tasks/", {}, 2),
+    ("GET", "/tasks/", {"params": {"limit": 2}}, 2),
+    ("GET", "/tasks/summary", {}, 2),
+    ("GET", "/tasks/search", {"params": {"q": "tarefa"}}, 1),
+    ("GET", "/tasks/export", {}, 1),
+    ("POST", "/tasks/", {"json": {"title": "Nova"}}, 3),
+    ("POST", "/tasks/batch", {"json": {"tasks": [{"title": t} for t in "ABC"]}}, 3),
+    ("PATCH", "/tasks/batch/complete", {"json": {"ids": BATCH_IDS}}, 3),
+    ("POST", "/tasks/batch/delete", {"json": {"ids": BATCH_IDS}}, 4),
+    ("PUT", "/tasks/{pending}", {"json": {"title": "Editada"}}, 4),
+    ("PATCH", "/tasks/{pending}/complete", {}, 4),
+    ("DELETE", "/tasks/{pending}", {}, 4),
+    ("POST", "/tasks/{pending}/share", {"json": {"user_email": "{friend}"}}, 4),
+    (
+        "POST",
+        "/tasks/{pending}/share/batch",
+        {"json": {"user_emails": ["{friend}", "{stranger}", "ninguem@exemplo.com"]}},
+        4,
+    ),
+    (
+        "POST",
+        "/users/login",
+        {"data": {"username": "{email}", "password": PASSWORD}},
+        1,
+    ),
+    ("POST", "/users/refresh", {"json": {"refresh_token": "{refresh}"}}, 2),
+    ("POST", "/users/logout", {"json": {"refresh_token": "{refresh}"}}, 4),
+    ("POST", "/users/logout/all", {}, 3),
+]
+
+# Os orçamentos acima valem para o token com as claims de identidade; o token
+# só com o e-mail acrescenta a busca do usuário nas rotas autenticadas
+TOKEN_KINDS = {
+    "stateless": (token_claims, 0),
+    "legacy": (lambda user: {"sub": user.email}, 1),
+}
+ANONYMOUS_PATHS = {"/users/login", "/users/refresh"}
+
+
+@pytest.fixture(scope="module")
+def password_hash() -> str:
+    return get_password_hash(PASSWORD)
+
+
+def _fill(value, context: dict):
+    """
+    Substitui os marcadores ("{pending}", "{friend}", ...) pelos dados do teste.
+    """
+    if isinstance(value, dict):
+        return {key: _fill(item, context) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_fill(item, context) for item in value]
+    if isinstance(value, str) and value.startswith("{") and value.endswith("}"):
+        return context[value[1:-1]]
+    if isinstance(value, str):
+        return value.format(**context)
+    return value
+
+
+@pytest.mark.parametrize(
+    "method, path, kwargs, budget",
+    QUERY_BUDGETS,
+    ids=[
+        f"{method} {path} {kwargs.get('params', '')}".strip()
+        for method, path, kwargs, _ in QUERY_BUDGETS
+    ],
+)
+@pytest.mark.parametrize("token_kind", TOKEN_KINDS)
+def test_endpoint_query_budget(
+    client: TestClient,
+    db_session: Session,
+    query_budget,
+    password_hash: str,
+    method: str,
+    path: str,
+    kwargs: dict,
+    budget: int,
+    token_kind: str,
+):
+    """
+    CT025: Orçamento de consultas SQL por endpoint
+    Entradas:
+        Usuário com tarefas próprias (uma compartilhada) e uma tarefa de
+        outro usuário compartilhada com ele; token de acesso só com o e-mail
+        ou com as claims de identidade.
+    Resultado Esperado:
+        Cada endpoint executa no máximo a quantidade de consultas do seu
+        orçamento e nenhuma consulta idêntica se repete (N+1).
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    user = User(
+        name="Wagner Luz", email="wagner.luz@exemplo.com", password=password_hash
+    )
+    friend = User(name="Xênia Rios", email="xenia.rios@exemplo.com", password="hash")
+    stranger = User(name="Yuri Maia", email="yuri.maia@exemplo.com", password="hash")
+    db_session.add_all([user, friend, stranger])
+    db_session.commit()
+    pending = Task(title="Tarefa pendente", owner_id=user.id)
+    other = Task(
+        title="Tarefa compartilhada", owner_id=user.id, shared_with_users=[friend]
+    )
+    received = Task(
+        title="Tarefa recebida", owner_id=friend.id, shared_with_users=[user]
+    )
+    db_session.add_all([pending, other, received])
+    db_session.commit()
+    context = {
+        "pending": pending.id,
+        "other": other.id,
+        "received": received.id,
+        "friend": friend.email,
+        "stranger": stranger.email,
+        "email": user.email,
+        "refresh": create_refresh_token(user),
+    }
+    claims, lookup_queries = TOKEN_KINDS[token_kind]
+    headers = {"Authorization": f"Bearer {create_access_token(claims(user))}"}
+    if path not in ANONYMOUS_PATHS:
+        budget += lookup_queries
+
+    # Act (Ação)
+    with query_budget(budget) as queries:
+        response = client.request(
+            method, _fill(path, context), headers=headers, **_fill(kwargs, context)
+        )
+
+    # Assert (Verificação)
+    assert response.status_code < 400, response.text
+    assert queries.count > 0
@@ -1,11 +1,21 @@
 import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from auth import (
     create_access_token,  # Importando a função para criar o token de autenticação
 )
 from database import Task, User  # Importando o modelo Task e User
+from database import create_database_engine, migrate
+from routers.task import (
+    ALREADY_SHARED_DETAIL,
+    DUPLICATE_TITLE_DETAIL,
+    commit_or_reject_duplicate_title,
+)
+from settings import Settings
 
 
 # Teste de edição de tarefa
@@ -131,3 +141,144 @@ def test_edit_task_database_communication(client: TestClient, db_session: Sessio
     updated_task_to_assert = db_session.query(Task).filter_by(id=task.id).first()
     assert updated_task_to_assert.title == updated_data["title"]
     assert updated_task_to_assert.description == updated_data["description"]
+
+
+def test_share_task_batch_endpoint(client: TestClient, db_session: Session):
+    """
+    CT014: Compartilhamento de tarefa com vários usuários via endpoint
+    Entradas:
+        E-mails: usuário ainda sem acesso, usuário já com acesso e e-mail
+        não cadastrado.
+    Resultado Esperado:
+        A tarefa é compartilhada com o novo usuário (200).
+        O usuário que já tinha acesso é rejeitado (400) e o e-mail não
+        cadastrado não é encontrado (404).
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    owner = User(name="Helena Dias", email="helena.dias@exemplo.com", password="hash")
+    new_member = User(name="Igor Lima", email="igor.lima@exemplo.com", password="hash")
+    member = User(name="Júlia Reis", email="julia.reis@exemplo.com", password="hash")
+    db_session.add_all([owner, new_member, member])
+    db_session.commit()
+    task = Task(title="Planejar sprint", owner_id=owner.id, shared_with_users=[member])
+    db_session.add(task)
+    db_session.commit()
+    token = create_access_token(data={"sub": owner.email})
+    emails = [new_member.email, member.email, "ninguem@exemplo.com"]
+
+    # Act (Ação)
+    response = client.post(
+        f"/tasks/{task.id}/share/batch",
+        json={"user_emails": emails},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    # Assert (Verificação)
+    assert response.status_code == 200
+    assert [result["user_email"] for result in response.json()] == emails
+    assert [result["status_code"] for result in response.json()] == [200, 400, 404]
+    db_session.expire_all()
+    assert {user.email for user in task.shared_with_users} == {
+        new_member.email,
+        member.email,
+    }
+
+
+def test_only_duplicate_title_becomes_400(tmp_path):
+    """
+    CT031: Apenas a violação do título único vira o erro de título duplicado
+    Entradas:
+        Banco com foreign_keys=ON; tarefa com título repetido para o mesmo
+        dono e tarefa de um usuário inexistente (ID 999).
+    Resultado Esperado:
+        O título repetido resulta em 400 com a mensagem de título duplicado.
+        A violação da chave estrangeira é propagada como IntegrityError.
+    Prioridade:
+        Alta
+    """
+    # Arrange (Preparação)
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'tasks.db'}", Settings())
+    migrate(engine)
+    db = Session(bind=engine)
+    user = User(name="Lia Campos", email="lia.campos@exemplo.com", password="h")
+    db.add(user)
+    db.commit()
+    db.add(Task(title="Única", owner_id=user.id))
+    db.commit()
+
+    # Act (Ação)
+    db.add(Task(title="Única", owner_id=user.id))
+    with pytest.raises(HTTPException) as duplicate:
+        commit_or_reject_duplicate_title(db)
+    db.add(Task(title="Órfã", owner_id=999))
+    with pytest.raises(IntegrityError) as foreign_key:
+        commit_or_reject_duplicate_title(db)
+    db.close()
+    engine.dispose()
+
+    # Assert (Verificação)
+    assert duplicate.value.status_code == 400
+    assert duplicate.value.detail == DUPLICATE_TITLE_DETAIL
+    assert "FOREIGN KEY" in str(foreign_key.value.orig)
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_concurrent_share_reports_already_shared(
+    client: TestClient, db_session: Session, engine, batch
+):
+    """
+    CT032: Compartilhamento concorrente com o mesmo usuário
+    Entradas:
+        Outra requisição grava o mesmo compartilhamento imediatamente antes
+        da inserção (endpoint individual e em lote).
+    Resultado Esperado:
+        A requisição que perdeu a corrida informa que a tarefa já está
+        compartilhada (400), sem erro de integridade.
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    owner = User(name="Rui Prado", email="rui.prado@exemplo.com", password="hash")
+    member = User(name="Sara Luz", email="sara.luz@exemplo.com", password="hash")
+    db_session.add_all([owner, member])
+    db_session.commit()
+    task = Task(title="Revisar contrato", owner_id=owner.id)
+    db_session.add(task)
+    db_session.commit()
+    token = create_access_token(data={"sub": owner.email})
+
+    def concurrent_share(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO task_shares"):
+            cursor.connection.execute(
+                "INSERT OR IGNORE INTO task_shares (task_id, user_id) VALUES (?, ?)",
+                (task.id, member.id),
+            )
+
+    # Act (Ação)
+    event.listen(engine, "before_cursor_execute", concurrent_share)
+    try:
+        if batch:
+            response = client.post(
+                f"/tasks/{task.id}/share/batch",
+                json={"user_emails": [member.email]},
+                headers={"Authorization": f"Bearer {token}"},
+            )
+        else:
+            response = client.post(
+                f"/tasks/{task.id}/share",
+                json={"user_email": member.email},
+                headers={"Authorization": f"Bearer {token}"},
+            )
+    finally:
+        event.remove(engine, "before_cursor_execute", concurrent_share)
+
+    # Assert (Verificação)
+    if batch:
+        assert response.status_code == 200
+        assert response.json()[0]["status_code"] == 400
+        assert response.json()[0]["detail"] == ALREADY_SHARED_DETAIL
+    else:
+        assert response.status_code == 400
+        assert response.json()["detail"] == ALREADY_SHARED_DETAIL
@@ -0,0 +1,171 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from auth import create_access_token
+from database import Task, User
+from routers.task import task_list_cache
+
+
+def _auth_headers(user: User, **extra) -> dict:
+    token = create_access_token(data={"sub": user.email})
+    return {"Authorization": f"Bearer {token}", **extra}
+
+
+def test_list_tasks_not_modified(client: TestClient, db_session: Session):
+    """
+    CT017: Listagem condicional com ETag
+    Entradas:
+        Requisição repetida com o cabeçalho If-None-Match igual ao ETag recebido.
+    Resultado Esperado:
+        A primeira listagem retorna 200 com ETag.
+        A repetição sem alterações retorna 304 sem corpo e sem consultar o
+        cache de respostas.
+        Após criar uma tarefa, o mesmo ETag volta a receber 200 com novo ETag.
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    user = User(name="Olga Matos", email="olga.matos@exemplo.com", password="hash")
+    db_session.add(user)
+    db_session.commit()
+    db_session.add(Task(title="Existente", owner_id=user.id))
+    db_session.commit()
+
+    # Act (Ação)
+    first = client.get("/tasks/", headers=_auth_headers(user))
+    etag = first.headers["ETag"]
+    stats_before = task_list_cache.stats()
+    not_modified = client.get(
+        "/tasks/", headers=_auth_headers(user, **{"If-None-Match": etag})
+    )
+    stats_after = task_list_cache.stats()
+    client.post("/tasks/", json={"title": "Nova"}, headers=_auth_headers(user))
+    modified = client.get(
+        "/tasks/", headers=_auth_headers(user, **{"If-None-Match": etag})
+    )
+
+    # Assert (Verificação)
+    assert first.status_code == 200
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+    assert stats_after["hits"] == stats_before["hits"]
+    assert stats_after["misses"] == stats_before["misses"]
+    assert modified.status_code == 200
+    assert modified.headers["ETag"] != etag
+    assert len(modified.json()) == 2
+
+
+def test_share_changes_recipient_etag(client: TestClient, db_session: Session):
+    """
+    CT018: Compartilhamento altera o ETag da listagem do destinatário
+    Entradas:
+        Tarefa do usuário A compartilhada com o usuário B.
+    Resultado Esperado:
+        O ETag de B muda após o compartilhamento e após a conclusão da tarefa
+        pelo dono, pois a listagem de B passa a refletir essas mudanças.
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    owner = User(name="Paulo Neves", email="paulo.neves@exemplo.com", password="h")
+    recipient = User(name="Quésia Luz", email="quesia.luz@exemplo.com", password="h")
+    db_session.add_all([owner, recipient])
+    db_session.commit()
+    task = Task(title="Compartilhável", owner_id=owner.id)
+    db_session.add(task)
+    db_session.commit()
+
+    # Act (Ação)
+    etags = [client.get("/tasks/", headers=_auth_headers(recipient)).headers["ETag"]]
+    client.post(
+        f"/tasks/{task.id}/share",
+        json={"user_email": recipient.email},
+        headers=_auth_headers(owner),
+    )
+    etags.append(
+        client.get("/tasks/", headers=_auth_headers(recipient)).headers["ETag"]
+    )
+    client.patch(f"/tasks/{task.id}/complete", headers=_auth_headers(owner))
+    etags.append(
+        client.get("/tasks/", headers=_auth_headers(recipient)).headers["ETag"]
+    )
+
+    # Assert (Verificação)
+    assert len(set(etags)) == 3
+
+
+def test_list_tasks_served_from_cache(client: TestClient, db_session: Session):
+    """
+    CT020: Listagem servida do cache e invalidada por escrita
+    Entradas:
+        Duas listagens seguidas, a conclusão de uma tarefa e nova listagem.
+    Resultado Esperado:
+        A segunda listagem é servida do cache com o mesmo corpo e ETag.
+        Após a conclusão, a listagem reflete a alteração.
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    user = User(name="Rita Sales", email="rita.sales@exemplo.com", password="hash")
+    db_session.add(user)
+    db_session.commit()
+    task = Task(title="Em cache", owner_id=user.id)
+    db_session.add(task)
+    db_session.commit()
+
+    # Act (Ação)
+    first = client.get("/tasks/", headers=_auth_headers(user))
+    hits_before = task_list_cache.stats()["hits"]
+    second = client.get("/tasks/", headers=_auth_headers(user))
+    hits_after = task_list_cache.stats()["hits"]
+    client.patch(f"/tasks/{task.id}/complete", headers=_auth_headers(user))
+    third = client.get("/tasks/", headers=_auth_headers(user))
+
+    # Assert (Verificação)
+    assert hits_after == hits_before + 1
+    assert second.content == first.content
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert first.json()[0]["is_completed"] is False
+    assert third.json()[0]["is_completed"] is True
+    assert third.headers["ETag"] != first.headers["ETag"]
+
+
+def test_list_tasks_follows_database_version(client: TestClient, db_session: Session):
+    """
+    CT028: Listagem em cache acompanha a versão gravada no banco
+    Entradas:
+        Listagem em cache; nova tarefa e versão da listagem incrementada
+        diretamente no banco, como faria outro worker.
+    Resultado Esperado:
+        A listagem seguinte não é servida do cache antigo: o ETag anterior
+        não recebe 304 e a nova tarefa aparece na resposta.
+    Prioridade:
+        Alta
+    """
+    # Arrange (Preparação)
+    user = User(name="Sara Dias", email="sara.dias@exemplo.com", password="hash")
+    db_session.add(user)
+    db_session.commit()
+    db_session.add(Task(title="Antiga", owner_id=user.id))
+    db_session.commit()
+    first = client.get("/tasks/", headers=_auth_headers(user))
+    etag = first.headers["ETag"]
+
+    # Act (Ação)
+    db_session.execute(
+        update(User)
+        .where(User.id == user.id)
+        .values(task_list_version=User.task_list_version + 1)
+    )
+    db_session.add(Task(title="De outro worker", owner_id=user.id))
+    db_session.commit()
+    second = client.get(
+        "/tasks/", headers=_auth_headers(user, **{"If-None-Match": etag})
+    )
+
+    # Assert (Verificação)
+    assert second.status_code == 200
+    assert second.headers["ETag"] != etag
+    assert [task["title"] for task in second.json()] == ["Antiga", "De outro worker"]
@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from auth import create_access_token
+from database import Task, User
+
+
+def _create_owner_and_shared_task(db_session: Session):
+    owner = User(name="Marcos Teles", email="marcos.teles@exemplo.com", password="h")
+    other = User(name="Nina Souza", email="nina.souza@exemplo.com", password="h")
+    db_session.add_all([owner, other])
+    db_session.commit()
+
+    db_session.add_all(
+        [
+            Task(title="Própria", description="Minha tarefa", owner_id=owner.id),
+            Task(title="Compartilhada", owner_id=other.id, shared_with_users=[owner]),
+            Task(title="Privada", owner_id=other.id),
+        ]
+    )
+    db_session.commit()
+    return owner
+
+
+def test_export_tasks_ndjson(client: TestClient, db_session: Session):
+    """
+    CT015: Exportação das tarefas do usuário em NDJSON
+    Entradas:
+        Usuário com uma tarefa própria e uma compartilhada; tarefa privada de outro usuário.
+    Resultado Esperado:
+        O sistema responde em streaming (código 200, application/x-ndjson)
+        com uma linha JSON por tarefa visível ao usuário.
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    owner = _create_owner_and_shared_task(db_session)
+    token = create_access_token(data={"sub": owner.email})
+
+    # Act (Ação)
+    response = client.get("/tasks/export", headers={"Authorization": f"Bearer {token}"})
+
+    # Assert (Verificação)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["title"] for line in lines] == ["Própria", "Compartilhada"]
+    assert lines[0] == {
+        "id": lines[0]["id"],
+        "title": "Própria",
+        "description": "Minha tarefa",
+        "is_completed": False,
+        "completion_date": None,
+        "owner_id": owner.id,
+    }
+
+
+def test_export_tasks_csv(client: TestClient, db_session: Session):
+    """
+    CT016: Exportação das tarefas do usuário em CSV
+    Entradas:
+        Formato: "csv"
+    Resultado Esperado:
+        O sistema responde com um cabeçalho e uma linha por tarefa visível.
+    Prioridade:
+        Baixa
+    """
+    # Arrange (Preparação)
+    owner = _create_owner_and_shared_task(db_session)
+    token = create_access_token(data={"sub": owner.email})
+
+    # Act (Ação)
+    response = client.get(
+        "/tasks/export",
+        params={"format": "csv"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    # Assert (Verificação)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["title"] for row in rows] == ["Própria", "Compartilhada"]
+    assert rows[0]["is_completed"] == "False"
@@ -123,3 +123,49 @@ def test_complete_task_database_communication(client: TestClient, db_session: Se
     # Assert (Verificação)
     completed_task_to_assert = db_session.query(Task).filter_by(id=task.id).first()
     assert completed_task_to_assert.is_completed is True
+
+
+def test_complete_tasks_batch_endpoint(client: TestClient, db_session: Session):
+    """
+    CT013: Conclusão de tarefas em lote via endpoint
+    Entradas:
+        IDs: tarefa pendente, tarefa já concluída, tarefa de outro usuário
+        e ID inexistente.
+    Resultado Esperado:
+        Apenas a tarefa pendente do usuário é concluída (200).
+        A já concluída é rejeitada (400) e as demais não são encontradas (404).
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    owner = User(name="Rita Nunes", email="rita.nunes@exemplo.com", password="hash")
+    other = User(name="Otávio Paz", email="otavio.paz@exemplo.com", password="hash")
+    db_session.add_all([owner, other])
+    db_session.commit()
+    pending = Task(title="Pendente", is_completed=False, owner_id=owner.id)
+    completed = Task(title="Concluída", is_completed=True, owner_id=owner.id)
+    foreign = Task(title="De outro", is_completed=False, owner_id=other.id)
+    db_session.add_all([pending, completed, foreign])
+    db_session.commit()
+    token = create_access_token(data={"sub": owner.email})
+
+    # Act (Ação)
+    response = client.patch(
+        "/tasks/batch/complete",
+        json={"ids": [pending.id, completed.id, foreign.id, 999999]},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    # Assert (Verificação)
+    assert response.status_code == 200
+    assert [result["status_code"] for result in response.json()] == [
+        200,
+        400,
+        404,
+        404,
+    ]
+    assert response.json()[1]["detail"] == "Tarefa já está concluída"
+    db_session.expire_all()
+    assert db_session.get(Task, pending.id).is_completed is True
+    assert db_session.get(Task, pending.id).completion_date is not None
+    assert db_session.get(Task, foreign.id).is_completed is False
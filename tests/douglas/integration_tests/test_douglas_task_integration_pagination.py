@@ -0,0 +1,268 @@
+import base64
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from auth import create_access_token
+from database import Task, User
+from routers.task import NEXT_CURSOR_HEADER
+
+
+def _create_user_with_tasks(db_session: Session, titles: list) -> User:
+    user = User(name="Paula Lima", email="paula.lima@exemplo.com", password="hash")
+    db_session.add(user)
+    db_session.commit()
+
+    for title in titles:
+        db_session.add(Task(title=title, description=None, owner_id=user.id))
+    db_session.commit()
+
+    return user
+
+
+def test_list_tasks_paginated_by_id(client: TestClient, db_session: Session):
+    """
+    CT009: Listagem paginada de tarefas via cursor
+    Entradas:
+        Usuário com 5 tarefas cadastradas.
+        Tamanho da página: 2
+    Resultado Esperado:
+        As páginas retornam no máximo 2 tarefas, ordenadas por ID.
+        Todas as tarefas são percorridas uma única vez seguindo o cursor.
+        A última página não possui cursor para a próxima.
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    user = _create_user_with_tasks(db_session, [f"Tarefa {i}" for i in range(5)])
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+
+    # Act (Ação)
+    pages = []
+    params = {"limit": 2}
+    while True:
+        response = client.get("/tasks/", params=params, headers=headers)
+        assert response.status_code == 200
+        pages.append([task["id"] for task in response.json()])
+        next_cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not next_cursor:
+            break
+        params = {"limit": 2, "cursor": next_cursor}
+
+    # Assert (Verificação)
+    ids = [task_id for page in pages for task_id in page]
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == 5
+
+
+def test_list_tasks_paginated_by_title(client: TestClient, db_session: Session):
+    """
+    CT010: Listagem paginada de tarefas ordenada por título
+    Entradas:
+        Usuário com as tarefas "C", "A" e "B".
+        Tamanho da página: 2, ordenação por título.
+    Resultado Esperado:
+        A primeira página retorna "A" e "B" e a segunda retorna "C".
+    Prioridade:
+        Baixa
+    """
+    # Arrange (Preparação)
+    user = _create_user_with_tasks(db_session, ["C", "A", "B"])
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+
+    # Act (Ação)
+    first_page = client.get(
+        "/tasks/", params={"limit": 2, "sort_by": "title"}, headers=headers
+    )
+    second_page = client.get(
+        "/tasks/",
+        params={
+            "limit": 2,
+            "sort_by": "title",
+            "cursor": first_page.headers[NEXT_CURSOR_HEADER],
+        },
+        headers=headers,
+    )
+
+    # Assert (Verificação)
+    assert [task["title"] for task in first_page.json()] == ["A", "B"]
+    assert [task["title"] for task in second_page.json()] == ["C"]
+    assert NEXT_CURSOR_HEADER not in second_page.headers
+
+
+def test_list_tasks_invalid_cursor(client: TestClient, db_session: Session):
+    """
+    CT011: Listagem com cursor inválido
+    Entradas:
+        Cursor: "nao-e-um-cursor"
+    Resultado Esperado:
+        O sistema responde com erro (código 400) informando que o cursor é inválido.
+    Prioridade:
+        Baixa
+    """
+    # Arrange (Preparação)
+    user = _create_user_with_tasks(db_session, ["Tarefa"])
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+
+    # Act (Ação)
+    response = client.get(
+        "/tasks/", params={"cursor": "nao-e-um-cursor"}, headers=headers
+    )
+
+    # Assert (Verificação)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cursor inválido"
+
+
+def _raw_cursor(payload: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+@pytest.mark.parametrize(
+    "path, params",
+    [
+        ("/tasks/", {"sort_by": "title", "limit": 1, "payload": ["title", [1], 3]}),
+        ("/tasks/", {"sort_by": "title", "limit": 1, "payload": ["title", "A", "3"]}),
+        ("/tasks/", {"limit": 1, "payload": ["id", {"a": 1}, 3]}),
+        ("/tasks/search", {"q": "tarefa", "payload": ["rank", "alto", 3]}),
+    ],
+)
+def test_list_tasks_cursor_with_wrong_types(
+    client: TestClient, db_session: Session, path: str, params: dict
+):
+    """
+    CT026: Cursor com valores de tipos inesperados
+    Entradas:
+        Cursores bem formados cujo valor de ordenação ou ID tem o tipo errado
+        (lista no título, ID em texto, texto no rank da busca)
+    Resultado Esperado:
+        O sistema responde com erro 400 (cursor inválido), sem erro interno.
+    Prioridade:
+        Baixa
+    """
+    # Arrange (Preparação)
+    user = _create_user_with_tasks(db_session, ["Tarefa"])
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+    query = {key: value for key, value in params.items() if key != "payload"}
+    query["cursor"] = _raw_cursor(params["payload"])
+
+    # Act (Ação)
+    response = client.get(path, params=query, headers=headers)
+
+    # Assert (Verificação)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cursor inválido"
+
+
+def test_list_tasks_sparse_fieldsets(client: TestClient, db_session: Session):
+    """
+    CT021: Listagem com projeção de campos (fields)
+    Entradas:
+        Usuário com 3 tarefas; fields=title,is_completed, ordenado por título,
+        página de 2 tarefas. Campo inexistente: "senha".
+    Resultado Esperado:
+        Cada tarefa contém apenas os campos pedidos e o cursor continua
+        funcionando mesmo sem o ID na resposta.
+        Um campo inexistente retorna erro 400.
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    user = _create_user_with_tasks(db_session, ["Cinema", "Academia", "Banco"])
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+    params = {"fields": "is_completed,title", "sort_by": "title", "limit": 2}
+
+    # Act (Ação)
+    first_page = client.get("/tasks/", params=params, headers=headers)
+    second_page = client.get(
+        "/tasks/",
+        params={**params, "cursor": first_page.headers[NEXT_CURSOR_HEADER]},
+        headers=headers,
+    )
+    invalid = client.get("/tasks/", params={"fields": "title,senha"}, headers=headers)
+
+    # Assert (Verificação)
+    assert first_page.json() == [
+        {"title": "Academia", "is_completed": False},
+        {"title": "Banco", "is_completed": False},
+    ]
+    assert second_page.json() == [{"title": "Cinema", "is_completed": False}]
+    assert invalid.status_code == 400
+    assert invalid.json()["detail"] == "Campos inválidos: senha"
+
+
+def test_list_tasks_uses_visibility_indexes(
+    client: TestClient, db_session: Session, query_plans
+):
+    """
+    CT029: Listagem resolvida pelos índices de dono e de compartilhamento
+    Entradas:
+        Usuário com tarefas próprias e uma tarefa compartilhada com ele.
+    Resultado Esperado:
+        A consulta das tarefas usa o índice por dono (ix_tasks_owner_id_title)
+        e o índice reverso dos compartilhamentos (ix_task_shares_user_id_task_id),
+        sem percorrer a tabela de tarefas.
+    Prioridade:
+        Alta
+    """
+    # Arrange (Preparação)
+    user = _create_user_with_tasks(db_session, ["Alfa", "Beta"])
+    other = User(name="Rui Costa", email="rui.costa@exemplo.com", password="hash")
+    db_session.add(other)
+    db_session.commit()
+    shared = Task(title="Gama", owner_id=other.id)
+    shared.shared_with_users.append(user)
+    db_session.add(shared)
+    db_session.commit()
+    token = create_access_token(data={"sub": user.email})
+
+    # Act (Ação)
+    with query_plans() as plans:
+        response = client.get("/tasks/", headers={"Authorization": f"Bearer {token}"})
+    task_plans = [plan for plan in plans if "tasks" in plan]
+
+    # Assert (Verificação)
+    assert [task["title"] for task in response.json()] == ["Alfa", "Beta", "Gama"]
+    assert any("ix_task_shares_user_id_task_id" in plan for plan in task_plans)
+    plan = next(plan for plan in task_plans if "ix_task_shares_user_id_task_id" in plan)
+    assert "ix_tasks_owner_id_title" in plan
+    assert "SCAN tasks" not in plan
+
+
+@pytest.mark.parametrize("sort_by", ["id", "title"])
+def test_list_tasks_cursor_page_reads_only_user_tasks(
+    client: TestClient, db_session: Session, query_plans, sort_by: str
+):
+    """
+    CT030: Página seguinte da listagem sem percorrer a tabela de tarefas
+    Entradas:
+        Segunda página (limit=1, com cursor), ordenada por ID e por título.
+    Resultado Esperado:
+        A consulta da página lê as tarefas pelo índice por dono, sem percorrer
+        a tabela de tarefas, de modo que o custo não depende do total de
+        tarefas de todos os usuários.
+    Prioridade:
+        Alta
+    """
+    # Arrange (Preparação)
+    user = _create_user_with_tasks(db_session, ["Alfa", "Beta", "Gama"])
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+    params = {"limit": 1, "sort_by": sort_by}
+    first = client.get("/tasks/", params=params, headers=headers)
+
+    # Act (Ação)
+    with query_plans() as plans:
+        second = client.get(
+            "/tasks/",
+            params={**params, "cursor": first.headers[NEXT_CURSOR_HEADER]},
+            headers=headers,
+        )
+    page_plan = next(plan for plan in plans if "ix_task_shares_user_id_task_id" in plan)
+
+    # Assert (Verificação)
+    assert [task["title"] for task in second.json()] == ["Beta"]
+    assert "ix_tasks_owner_id_title" in page_plan
+    assert "SCAN tasks" not in page_plan
@@ -0,0 +1,74 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from auth import create_access_token
+from database import Task, User
+from routers.task import NEXT_CURSOR_HEADER
+
+
+def _auth_headers(user: User) -> dict:
+    token = create_access_token(data={"sub": user.email})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_search_tasks_ranking_prefix_and_visibility(
+    client: TestClient, db_session: Session
+):
+    """
+    CT023: Busca textual de tarefas
+    Entradas:
+        Tarefas próprias, uma compartilhada e uma de outro usuário não
+        compartilhada, todas mencionando "relatório".
+        Busca por "relat" (prefixo, sem acento), com página de 2 tarefas.
+    Resultado Esperado:
+        Retorna apenas as tarefas visíveis, com a mais relevante (termo no
+        título e na descrição) primeiro, percorrendo as páginas pelo cursor.
+        Após editar e excluir tarefas, a busca reflete as alterações.
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    user = User(name="Úrsula Pinto", email="ursula.pinto@exemplo.com", password="h")
+    other = User(name="Vitor Costa", email="vitor.costa@exemplo.com", password="h")
+    db_session.add_all([user, other])
+    db_session.commit()
+    best = Task(
+        title="Relatório financeiro",
+        description="Revisar o relatório do trimestre",
+        owner_id=user.id,
+    )
+    renamed = Task(title="Relatório de vendas", owner_id=user.id)
+    deleted = Task(
+        title="Rascunho", description="Ideias para o relatório", owner_id=user.id
+    )
+    shared = Task(
+        title="Relatório da equipe", owner_id=other.id, shared_with_users=[user]
+    )
+    hidden = Task(title="Relatório secreto", owner_id=other.id)
+    unrelated = Task(title="Academia", owner_id=user.id)
+    db_session.add_all([best, renamed, deleted, shared, hidden, unrelated])
+    db_session.commit()
+    headers = _auth_headers(user)
+
+    # Act (Ação)
+    pages = []
+    params = {"q": "relat", "limit": 2}
+    while True:
+        response = client.get("/tasks/search", params=params, headers=headers)
+        assert response.status_code == 200
+        pages.append(response.json())
+        if NEXT_CURSOR_HEADER not in response.headers:
+            break
+        params["cursor"] = response.headers[NEXT_CURSOR_HEADER]
+    client.put(f"/tasks/{renamed.id}", json={"title": "Vendas"}, headers=headers)
+    client.delete(f"/tasks/{deleted.id}", headers=headers)
+    after_changes = client.get("/tasks/search", params={"q": "relat"}, headers=headers)
+    invalid = client.get("/tasks/search", params={"q": "--"}, headers=headers)
+
+    # Assert (Verificação)
+    found = [task["id"] for page in pages for task in page]
+    assert [len(page) for page in pages] == [2, 2]
+    assert found[0] == best.id
+    assert sorted(found) == sorted([best.id, renamed.id, deleted.id, shared.id])
+    assert {task["id"] for task in after_changes.json()} == {best.id, shared.id}
+    assert invalid.status_code == 400
@@ -0,0 +1,64 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from auth import create_access_token
+from database import Task, User
+
+
+def _auth_headers(user: User) -> dict:
+    token = create_access_token(data={"sub": user.email})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_task_summary_counts(client: TestClient, db_session: Session):
+    """
+    CT022: Resumo das tarefas por status e por origem
+    Entradas:
+        Usuário com 3 tarefas próprias (1 concluída) e 2 tarefas de outro
+        usuário compartilhadas com ele (1 concluída).
+        Após o resumo, uma tarefa própria é concluída.
+    Resultado Esperado:
+        O resumo informa os totais gerais, das próprias e das compartilhadas.
+        A conclusão da tarefa é refletida no resumo seguinte.
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    user = User(name="Sara Dias", email="sara.dias@exemplo.com", password="hash")
+    friend = User(name="Tiago Reis", email="tiago.reis@exemplo.com", password="hash")
+    db_session.add_all([user, friend])
+    db_session.commit()
+    own_pending = Task(title="Própria 1", owner_id=user.id)
+    db_session.add_all(
+        [
+            own_pending,
+            Task(title="Própria 2", owner_id=user.id),
+            Task(title="Própria 3", is_completed=True, owner_id=user.id),
+            Task(title="Dele 1", owner_id=friend.id, shared_with_users=[user]),
+            Task(
+                title="Dele 2",
+                is_completed=True,
+                owner_id=friend.id,
+                shared_with_users=[user],
+            ),
+            Task(title="Não compartilhada", owner_id=friend.id),
+        ]
+    )
+    db_session.commit()
+
+    # Act (Ação)
+    before = client.get("/tasks/summary", headers=_auth_headers(user))
+    client.patch(f"/tasks/{own_pending.id}/complete", headers=_auth_headers(user))
+    after = client.get("/tasks/summary", headers=_auth_headers(user))
+
+    # Assert (Verificação)
+    assert before.status_code == 200
+    assert before.json() == {
+        "total": 5,
+        "completed": 2,
+        "pending": 3,
+        "owned": {"total": 3, "completed": 1, "pending": 2},
+        "shared": {"total": 2, "completed": 1, "pending": 1},
+    }
+    assert after.json()["completed"] == 3
+    assert after.json()["owned"] == {"total": 3, "completed": 2, "pending": 1}
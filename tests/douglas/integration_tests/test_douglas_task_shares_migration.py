@@ -0,0 +1,157 @@
+from sqlalchemy import create_engine, inspect
+
+from database import Base, Task, User, run_migrations
+
+
+def test_task_shares_migration_adds_primary_key():
+    """
+    CT012: Migração da tabela de compartilhamentos de bancos antigos
+    Entradas:
+        Banco com a tabela task_shares sem chave primária e com um
+        compartilhamento duplicado.
+    Resultado Esperado:
+        A tabela passa a ter chave primária (task_id, user_id) e o índice reverso.
+        Os compartilhamentos duplicados são removidos e os demais preservados.
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine, tables=[User.__table__, Task.__table__])
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE task_shares ("
+            "task_id INTEGER REFERENCES tasks (id), "
+            "user_id INTEGER REFERENCES users (id))"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO task_shares (task_id, user_id) VALUES (1, 2), (1, 2), (1, 3)"
+        )
+
+    # Act (Ação)
+    run_migrations(engine)
+
+    # Assert (Verificação)
+    inspector = inspect(engine)
+    primary_key = inspector.get_pk_constraint("task_shares")["constrained_columns"]
+    index_names = [index["name"] for index in inspector.get_indexes("task_shares")]
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(
+            "SELECT task_id, user_id FROM task_shares ORDER BY user_id"
+        ).all()
+
+    assert primary_key == ["task_id", "user_id"]
+    assert "ix_task_shares_user_id_task_id" in index_names
+    assert [tuple(row) for row in rows] == [(1, 2), (1, 3)]
+
+
+def test_users_migration_adds_task_list_version():
+    """
+    CT019: Migração da coluna de versão da listagem em bancos antigos
+    Entradas:
+        Banco com a tabela users sem a coluna task_list_version e um usuário.
+    Resultado Esperado:
+        A coluna é adicionada e o usuário existente recebe a versão 0.
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    engine = create_engine("sqlite:///:memory:")
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE users (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, "
+            "email VARCHAR, password VARCHAR NOT NULL)"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO users (name, email, password) VALUES ('Ana', 'a@a.com', 'h')"
+        )
+    Base.metadata.create_all(bind=engine)
+
+    # Act (Ação)
+    run_migrations(engine)
+
+    # Assert (Verificação)
+    with engine.connect() as connection:
+        version = connection.exec_driver_sql(
+            "SELECT task_list_version FROM users"
+        ).scalar()
+    assert version == 0
+
+
+def test_tasks_migration_builds_search_index():
+    """
+    CT024: Migração do índice de busca em bancos antigos
+    Entradas:
+        Banco com a tabela tasks criada sem o índice FTS5 e uma tarefa.
+    Resultado Esperado:
+        O índice é criado e populado com a tarefa existente.
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    engine = create_engine("sqlite:///:memory:")
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE tasks (id INTEGER PRIMARY KEY, title VARCHAR, "
+            "description VARCHAR, is_completed BOOLEAN, completion_date DATETIME, "
+            "owner_id INTEGER)"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO tasks (title, description, owner_id) "
+            "VALUES ('Orçamento', 'Planilha anual', 1)"
+        )
+    Base.metadata.create_all(bind=engine)
+
+    # Act (Ação)
+    run_migrations(engine)
+
+    # Assert (Verificação)
+    with engine.connect() as connection:
+        matches = connection.exec_driver_sql(
+            "SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH 'planilha'"
+        ).all()
+    assert [tuple(row) for row in matches] == [(1,)]
+
+
+def test_tasks_migration_renames_duplicate_titles():
+    """
+    CT027: Migração do índice único de títulos com duplicatas
+    Entradas:
+        Banco antigo, sem o índice (owner_id, title), com duas tarefas
+        "Compras" do mesmo usuário e uma "Compras" de outro usuário.
+    Resultado Esperado:
+        A migração cria o índice único; a tarefa repetida mais nova recebe o
+        ID no título e as demais são preservadas.
+    Prioridade:
+        Alta
+    """
+    # Arrange (Preparação)
+    engine = create_engine("sqlite:///:memory:")
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE tasks (id INTEGER PRIMARY KEY, title VARCHAR, "
+            "description VARCHAR, is_completed BOOLEAN, completion_date DATETIME, "
+            "owner_id INTEGER)"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO tasks (id, title, owner_id) "
+            "VALUES (1, 'Compras', 1), (2, 'Compras', 1), (3, 'Compras', 2)"
+        )
+    Base.metadata.create_all(bind=engine)
+
+    # Act (Ação)
+    run_migrations(engine)
+
+    # Assert (Verificação)
+    index_names = [index["name"] for index in inspect(engine).get_indexes("tasks")]
+    with engine.connect() as connection:
+        titles = connection.exec_driver_sql(
+            "SELECT id, title FROM tasks ORDER BY id"
+        ).all()
+
+    assert "ix_tasks_owner_id_title" in index_names
+    assert [tuple(row) for row in titles] == [
+        (1, "Compras"),
+        (2, "Compras (2)"),
+        (3, "Compras"),
+    ]
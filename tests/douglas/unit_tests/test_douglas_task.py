@@ -408,10 +408,14 @@ def test_task_sharing():
         task,
         share_user,
     ]
+    mock_db.scalars.return_value = [share_user.id]
 
     response = share_task(
         task_id, ShareTask(user_email=share_user_email), mock_current_user, mock_db
     )
 
     assert response == {"msg": f"Tarefa compartilhada com {share_user_email}"}
-    assert task.shared_with_users[0] == share_user
+    assert mock_db.scalars.call_args.args[1] == [
+        {"task_id": task_id, "user_id": share_user.id}
+    ]
+    mock_db.commit.assert_called_once()
@@ -1,8 +1,27 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
-from auth import authenticate_user, get_password_hash
-from database import User
+from auth import (
+    Principal,
+    authenticate_user,
+    create_access_token,
+    decode_token,
+    get_current_user,
+    get_password_hash,
+    revoke_token,
+    revoke_user_tokens,
+    revoked_tokens,
+    token_claims,
+    user_cache,
+)
+from database import RevokedToken, User
+from revocation import RevocationList
+from settings import settings
 
 
 def test_user_login_endpoint(client: TestClient, db_session: Session):
@@ -86,3 +105,381 @@ def test_user_login_database_communication(db_session: Session):
     assert authenticated_user is not False
     assert authenticated_user.email == user_data["email"]
     assert authenticated_user.name == user_data["name"]
+
+
+def test_current_user_is_cached_and_invalidated(db_session: Session):
+    """
+    CT005: Cache do usuário autenticado e invalidação após alteração
+    Entradas:
+        Token válido do usuário "carla.melo@exemplo.com"
+    Resultado Esperado:
+        A segunda autenticação com o mesmo token é servida pelo cache.
+        Após alterar o usuário, o cache é invalidado e o banco é consultado.
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    user = User(name="Carla Melo", email="carla.melo@exemplo.com", password="hash")
+    db_session.add(user)
+    db_session.commit()
+    token = create_access_token(data={"sub": user.email})
+
+    # Act (Ação)
+    first_user = get_current_user(token, db_session)
+    cached_user = get_current_user(token, db_session)
+    stats_after_cache = user_cache.stats()
+
+    user.name = "Carla Melo Souza"
+    db_session.commit()
+    reloaded_user = get_current_user(token, db_session)
+
+    # Assert (Verificação)
+    assert first_user.id == cached_user.id == user.id
+    assert stats_after_cache["hits"] == 1
+    assert stats_after_cache["misses"] == 1
+    assert reloaded_user.name == "Carla Melo Souza"
+    assert user_cache.stats()["misses"] == 2
+
+
+def test_current_user_from_token_claims(db_session: Session, count_queries):
+    """
+    CT018: Identidade do usuário lida das claims do token
+    Entradas:
+        Token com ID e carimbo de segurança do usuário "bruno.lima@exemplo.com"
+    Resultado Esperado:
+        A autenticação não consulta o banco; o nome é carregado sob demanda.
+        Após revogar os tokens do usuário, o mesmo token é recusado (401).
+    Prioridade:
+        Alta
+    """
+    # Arrange (Preparação)
+    user = User(name="Bruno Lima", email="bruno.lima@exemplo.com", password="hash")
+    db_session.add(user)
+    db_session.commit()
+    token = create_access_token(data=token_claims(user))
+
+    # Act (Ação)
+    with count_queries() as counter:
+        principal = get_current_user(token, db_session)
+    name = principal.name
+
+    revoke_user_tokens(user)
+    db_session.commit()
+    with pytest.raises(HTTPException) as revoked:
+        get_current_user(token, db_session)
+
+    # Assert (Verificação)
+    assert isinstance(principal, Principal)
+    assert principal.id == user.id
+    assert counter.count == 0
+    assert name == "Bruno Lima"
+    assert revoked.value.status_code == 401
+
+
+def test_refresh_and_logout_revoke_tokens(client: TestClient, db_session: Session):
+    """
+    CT019: Renovação e revogação de tokens via endpoints
+    Entradas:
+        Login de "diana.rocha@exemplo.com", renovação do par e logout
+    Resultado Esperado:
+        O refresh token gera um novo par e não pode ser reutilizado; após o
+        logout, o token de acesso e o refresh token são recusados (401).
+    Prioridade:
+        Alta
+    """
+    # Arrange (Preparação)
+    client.post(
+        "/users/",
+        json={
+            "name": "Diana Rocha",
+            "email": "diana.rocha@exemplo.com",
+            "password": "SenhaForte123",
+        },
+    )
+    login = client.post(
+        "/users/login",
+        data={"username": "diana.rocha@exemplo.com", "password": "SenhaForte123"},
+    ).json()
+
+    # Act (Ação)
+    refreshed = client.post(
+        "/users/refresh", json={"refresh_token": login["refresh_token"]}
+    )
+    reused = client.post(
+        "/users/refresh", json={"refresh_token": login["refresh_token"]}
+    )
+    tokens = refreshed.json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    before_logout = client.get("/tasks/", headers=headers)
+    logout = client.post(
+        "/users/logout",
+        json={"refresh_token": tokens["refresh_token"]},
+        headers=headers,
+    )
+    after_logout = client.get("/tasks/", headers=headers)
+    refresh_after_logout = client.post(
+        "/users/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+
+    # Assert (Verificação)
+    assert refreshed.status_code == 200
+    assert reused.status_code == 401
+    assert before_logout.status_code == 200
+    assert logout.status_code == 204
+    assert after_logout.status_code == 401
+    assert refresh_after_logout.status_code == 401
+
+
+def test_revocation_list_reloaded_from_database(db_session: Session):
+    """
+    CT020: Lista de revogação carregada do banco
+    Entradas:
+        Token revogado e confirmado no banco; nova lista de revogação
+    Resultado Esperado:
+        A nova lista (como a de outro worker ou após reiniciar) carrega o
+        token revogado do banco e o reconhece em memória.
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    user = User(name="Eduardo Reis", email="eduardo.reis@exemplo.com", password="hash")
+    db_session.add(user)
+    db_session.commit()
+    token = create_access_token(data=token_claims(user))
+    payload = decode_token(token, db_session)
+    revoke_token(payload, db_session)
+    db_session.commit()
+
+    # Act (Ação)
+    revocations = RevocationList(sync_interval=60)
+    before_sync = payload["jti"] in revocations
+    revocations.sync(db_session)
+
+    # Assert (Verificação)
+    assert before_sync is False
+    assert payload["jti"] in revocations
+    assert len(revocations) == 1
+
+
+def test_logout_all_revokes_tokens_in_every_worker(
+    client: TestClient, db_session: Session
+):
+    """
+    CT025: Encerramento de todas as sessões do usuário
+    Entradas:
+        Dois logins de "fabio.nunes@exemplo.com" e logout de todas as sessões
+    Resultado Esperado:
+        Os tokens de acesso e os refresh tokens dos dois logins são recusados
+        (401). Uma nova lista de revogação, como a de outro worker, carrega
+        do banco o carimbo alterado e também recusa os tokens anteriores.
+    Prioridade:
+        Alta
+    """
+    # Arrange (Preparação)
+    credentials = {"username": "fabio.nunes@exemplo.com", "password": "SenhaForte123"}
+    client.post(
+        "/users/",
+        json={
+            "name": "Fábio Nunes",
+            "email": credentials["username"],
+            "password": credentials["password"],
+        },
+    )
+    sessions = [client.post("/users/login", data=credentials).json() for _ in "12"]
+    headers = [
+        {"Authorization": f"Bearer {tokens['access_token']}"} for tokens in sessions
+    ]
+    user = db_session.query(User).filter(User.email == credentials["username"]).one()
+    old_stamp = user.security_stamp
+
+    # Act (Ação)
+    logout = client.post("/users/logout/all", headers=headers[0])
+    listings = [client.get("/tasks/", headers=h).status_code for h in headers]
+    refreshes = [
+        client.post(
+            "/users/refresh", json={"refresh_token": tokens["refresh_token"]}
+        ).status_code
+        for tokens in sessions
+    ]
+    other_worker = RevocationList(sync_interval=60)
+    other_worker.sync(db_session)
+
+    # Assert (Verificação)
+    assert logout.status_code == 204
+    assert listings == [401, 401]
+    assert refreshes == [401, 401]
+    assert other_worker.accepts_stamp(user.id, old_stamp) is False
+    assert other_worker.accepts_stamp(user.id, old_stamp + 1) is True
+
+
+def test_legacy_lookup_checks_security_stamp(db_session: Session, mocker_fixture):
+    """
+    CT026: Carimbo de segurança conferido na busca do usuário pelo e-mail
+    Entradas:
+        AUTH_STATELESS_TOKENS=false; carimbo do usuário incrementado
+        diretamente no banco após a emissão do token
+    Resultado Esperado:
+        O token emitido com o carimbo anterior é recusado (401).
+    Prioridade:
+        Alta
+    """
+    # Arrange (Preparação)
+    mocker_fixture.patch_object(settings, "auth_stateless_tokens", new=False)
+    user = User(name="Gabriela Pires", email="gabriela.pires@exemplo.com", password="h")
+    db_session.add(user)
+    db_session.commit()
+    token = create_access_token(data=token_claims(user))
+    valid_user = get_current_user(token, db_session)
+
+    # Act (Ação)
+    db_session.execute(
+        update(User)
+        .where(User.id == user.id)
+        .values(security_stamp=User.security_stamp + 1)
+    )
+    db_session.commit()
+    user_cache.clear()
+    with pytest.raises(HTTPException) as revoked:
+        get_current_user(token, db_session)
+
+    # Assert (Verificação)
+    assert valid_user.id == user.id
+    assert revoked.value.status_code == 401
+
+
+def test_refresh_token_used_only_once(client: TestClient, db_session: Session):
+    """
+    CT027: Refresh token aceito uma única vez, mesmo em outro worker
+    Entradas:
+        Revogação repetida do mesmo token neste processo; refresh token já
+        gravado em revoked_tokens por outro worker, ainda não sincronizado
+    Resultado Esperado:
+        A revogação só vale em memória após o commit; depois dele, a segunda
+        revogação é recusada (401). A renovação com o token usado no outro
+        worker é recusada (401) no commit, sem emitir novo par.
+    Prioridade:
+        Alta
+    """
+    # Arrange (Preparação)
+    client.post(
+        "/users/",
+        json={
+            "name": "Helena Prado",
+            "email": "helena.prado@exemplo.com",
+            "password": "SenhaForte123",
+        },
+    )
+    login = client.post(
+        "/users/login",
+        data={"username": "helena.prado@exemplo.com", "password": "SenhaForte123"},
+    ).json()
+    access = decode_token(login["access_token"], db_session)
+    refresh = decode_token(login["refresh_token"], db_session)
+
+    # Act (Ação)
+    revoke_token(access, db_session)
+    before_commit = access["jti"] in revoked_tokens
+    db_session.commit()
+    with pytest.raises(HTTPException) as repeated:
+        revoke_token(access, db_session)
+    db_session.add(RevokedToken(jti=refresh["jti"], expires_at=datetime(2100, 1, 1)))
+    db_session.commit()
+    known_locally = refresh["jti"] in revoked_tokens
+    reused = client.post(
+        "/users/refresh", json={"refresh_token": login["refresh_token"]}
+    )
+
+    # Assert (Verificação)
+    assert before_commit is False
+    assert repeated.value.status_code == 401
+    assert known_locally is False
+    assert reused.status_code == 401
+    assert "access_token" not in reused.json()
+
+
+def test_logout_with_invalid_refresh_token_revokes_nothing(
+    client: TestClient, db_session: Session
+):
+    """
+    CT028: Logout recusado não revoga nenhum token
+    Entradas:
+        Logout de "igor.vaz@exemplo.com" com o refresh token de outro usuário
+    Resultado Esperado:
+        O logout é recusado (400). Nenhuma revogação é gravada no banco e o
+        token de acesso continua aceito neste worker.
+    Prioridade:
+        Alta
+    """
+    # Arrange (Preparação)
+    sessions = []
+    for name, email in (
+        ("Igor Vaz", "igor.vaz@exemplo.com"),
+        ("Júlia Reis", "julia.reis@exemplo.com"),
+    ):
+        client.post(
+            "/users/",
+            json={"name": name, "email": email, "password": "SenhaForte123"},
+        )
+        sessions.append(
+            client.post(
+                "/users/login", data={"username": email, "password": "SenhaForte123"}
+            ).json()
+        )
+    headers = {"Authorization": f"Bearer {sessions[0]['access_token']}"}
+
+    # Act (Ação)
+    logout = client.post(
+        "/users/logout",
+        json={"refresh_token": sessions[1]["refresh_token"]},
+        headers=headers,
+    )
+    listing = client.get("/tasks/", headers=headers)
+
+    # Assert (Verificação)
+    assert logout.status_code == 400
+    assert listing.status_code == 200
+    assert db_session.query(RevokedToken).count() == 0
+    assert len(revoked_tokens) == 0
+
+
+def test_refresh_revocations_stay_out_of_memory(
+    client: TestClient, db_session: Session
+):
+    """
+    CT029: Refresh tokens usados ficam apenas no banco
+    Entradas:
+        Três renovações seguidas de "karen.luz@exemplo.com" e a reutilização
+        do primeiro refresh token
+    Resultado Esperado:
+        As renovações gravam três revogações no banco sem aumentar a lista em
+        memória; a reutilização é recusada (401) pela chave única do jti.
+    Prioridade:
+        Alta
+    """
+    # Arrange (Preparação)
+    client.post(
+        "/users/",
+        json={
+            "name": "Karen Luz",
+            "email": "karen.luz@exemplo.com",
+            "password": "SenhaForte123",
+        },
+    )
+    tokens = client.post(
+        "/users/login",
+        data={"username": "karen.luz@exemplo.com", "password": "SenhaForte123"},
+    ).json()
+    first_refresh_token = tokens["refresh_token"]
+
+    # Act (Ação)
+    for _ in range(3):
+        tokens = client.post(
+            "/users/refresh", json={"refresh_token": tokens["refresh_token"]}
+        ).json()
+    reused = client.post("/users/refresh", json={"refresh_token": first_refresh_token})
+
+    # Assert (Verificação)
+    assert "refresh_token" in tokens
+    assert reused.status_code == 401
+    assert db_session.query(RevokedToken).count() == 3
+    assert len(revoked_tokens) == 0
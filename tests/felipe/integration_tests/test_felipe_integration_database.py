@@ -0,0 +1,208 @@
+# tests/felipe/integration_tests/test_felipe_integration_database.py
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import inspect
+from sqlalchemy.pool import QueuePool
+
+from database import create_database_engine, sqlite_pragmas
+from main import create_app
+from settings import Settings
+
+
+def test_sqlite_engine_profile(tmp_path):
+    """
+    CT009: Perfil do engine SQLite definido pelas configurações
+    Entradas:
+        Pool "queue" com 3 conexões; cache de 2000 páginas; demais PRAGMAs padrão
+    Resultado Esperado:
+        O engine usa o pool configurado e cada conexão aplica WAL,
+        synchronous=NORMAL, busy_timeout, cache_size e foreign_keys.
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    settings = Settings(
+        database_pool_class="queue", database_pool_size=3, sqlite_cache_size=2000
+    )
+
+    # Act (Ação)
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'tasks.db'}", settings)
+    with engine.connect() as connection:
+        pragmas = {
+            name: connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+            for name in (
+                "journal_mode",
+                "synchronous",
+                "busy_timeout",
+                "cache_size",
+                "foreign_keys",
+            )
+        }
+    engine.dispose()
+
+    # Assert (Verificação)
+    assert isinstance(engine.pool, QueuePool)
+    assert engine.pool.size() == 3
+    assert pragmas == {
+        "journal_mode": "wal",
+        "synchronous": 1,
+        "busy_timeout": 5000,
+        "cache_size": 2000,
+        "foreign_keys": 1,
+    }
+
+
+def test_sqlite_engine_profile_disabled_pragma(tmp_path):
+    """
+    CT010: PRAGMA desativado pelas configurações
+    Entradas:
+        journal_mode vazio
+    Resultado Esperado:
+        O banco mantém o journal padrão do SQLite (delete).
+    Prioridade:
+        Baixa
+    """
+    # Arrange (Preparação)
+    settings = Settings(sqlite_journal_mode="")
+
+    # Act (Ação)
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'tasks.db'}", settings)
+    with engine.connect() as connection:
+        journal_mode = connection.exec_driver_sql("PRAGMA journal_mode").scalar()
+    engine.dispose()
+
+    # Assert (Verificação)
+    assert journal_mode == "delete"
+
+
+def test_create_app_lifespan_manages_engine(tmp_path):
+    """
+    CT017: Engine criado na inicialização da aplicação
+    Entradas:
+        create_app com um banco temporário, com e sem migrate_on_startup
+    Resultado Esperado:
+        Criar a aplicação não gera o arquivo do banco; sem migrações na
+        inicialização o esquema não é alterado; com elas, as tabelas são
+        criadas e as rotas usam o engine da aplicação.
+    Prioridade:
+        Alta
+    """
+    # Arrange (Preparação)
+    database_path = tmp_path / "tasks.db"
+    settings = Settings(database_url=f"sqlite:///{database_path}")
+
+    # Act (Ação)
+    app = create_app(settings)
+    created_at_import = database_path.exists()
+    with TestClient(app):
+        tables_without_migrations = inspect(app.state.engine).get_table_names()
+
+    migrated_app = create_app(settings.model_copy(update={"migrate_on_startup": True}))
+    with TestClient(migrated_app) as client:
+        response = client.post(
+            "/users/",
+            json={"name": "Ana", "email": "ana@example.com", "password": "Senha123"},
+        )
+
+    # Assert (Verificação)
+    assert created_at_import is False
+    assert tables_without_migrations == []
+    assert response.status_code == 201
+    assert "tasks" in inspect(migrated_app.state.engine).get_table_names()
+
+
+def test_async_database_url_follows_database_url():
+    """
+    CT022: URL do banco assíncrono derivada de DATABASE_URL
+    Entradas:
+        database_url apontando para outro arquivo, com e sem async_database_url
+    Resultado Esperado:
+        Sem URL assíncrona explícita, o engine assíncrono usa o mesmo arquivo
+        com o driver aiosqlite; a URL explícita é mantida.
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    settings = Settings(database_url="sqlite:////dados/tarefas.db")
+    explicit = settings.model_copy(
+        update={"async_database_url": "sqlite+aiosqlite:///./outro.db"}
+    )
+
+    # Act (Ação)
+    derived_url = settings.resolved_async_database_url()
+    explicit_url = explicit.resolved_async_database_url()
+
+    # Assert (Verificação)
+    assert derived_url == "sqlite+aiosqlite:////dados/tarefas.db"
+    assert explicit_url == "sqlite+aiosqlite:///./outro.db"
+
+
+def test_settings_empty_env_disables_pragmas(tmp_path, mocker_fixture):
+    """
+    CT030: PRAGMAs numéricos desativados por variáveis de ambiente vazias
+    Entradas:
+        SQLITE_MMAP_SIZE, SQLITE_BUSY_TIMEOUT e SQLITE_FOREIGN_KEYS vazias
+    Resultado Esperado:
+        As configurações são carregadas sem erro, os três PRAGMAs deixam de
+        ser aplicados e as conexões mantêm os valores padrão do SQLite.
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    mocker_fixture.patch(
+        "os.environ",
+        new={
+            "SQLITE_MMAP_SIZE": "",
+            "SQLITE_BUSY_TIMEOUT": "",
+            "SQLITE_FOREIGN_KEYS": "",
+        },
+    )
+
+    # Act (Ação)
+    settings = Settings.from_env()
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'tasks.db'}", settings)
+    with engine.connect() as connection:
+        mmap_size = connection.exec_driver_sql("PRAGMA mmap_size").scalar()
+        foreign_keys = connection.exec_driver_sql("PRAGMA foreign_keys").scalar()
+    engine.dispose()
+
+    # Assert (Verificação)
+    assert settings.sqlite_mmap_size is None
+    assert settings.sqlite_busy_timeout is None
+    assert settings.sqlite_foreign_keys is None
+    assert set(sqlite_pragmas(settings)) == {
+        "journal_mode",
+        "synchronous",
+        "cache_size",
+    }
+    assert mmap_size == 0
+    assert foreign_keys == 0
+
+
+def test_create_app_rejects_process_settings(tmp_path):
+    """
+    CT031: Fábrica rejeita configurações que valem para o processo inteiro
+    Entradas:
+        create_app com outra serialização da listagem e outro tamanho do
+        cache de usuários
+    Resultado Esperado:
+        A criação falha com ValueError indicando os campos que a fábrica não
+        aplicaria, em vez de ignorá-los silenciosamente.
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    settings = Settings(
+        database_url=f"sqlite:///{tmp_path / 'tasks.db'}",
+        task_serialization="orm",
+        user_cache_size=1,
+    )
+
+    # Act (Ação)
+    with pytest.raises(ValueError) as error:
+        create_app(settings)
+
+    # Assert (Verificação)
+    assert "user_cache_size" in str(error.value)
+    assert "task_serialization" in str(error.value)
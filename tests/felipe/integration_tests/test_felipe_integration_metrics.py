@@ -0,0 +1,55 @@
+# tests/felipe/integration_tests/test_felipe_integration_metrics.py
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from auth import create_access_token
+from database import Task, User
+
+
+def test_metrics_endpoint(client: TestClient, db_session: Session):
+    """
+    CT013: Exposição das métricas no formato do Prometheus
+    Entradas:
+        Duas requisições à edição de tarefas (uma inexistente) e a coleta
+        em /metrics.
+    Resultado Esperado:
+        As requisições são contadas pelo path da rota (sem o ID) e pelo
+        status, com histograma de latência. A fila do bcrypt e os caches
+        também são expostos.
+    Prioridade:
+        Baixa
+    """
+    # Arrange (Preparação)
+    user = User(name="Kátia Moura", email="katia.moura@exemplo.com", password="hash")
+    db_session.add(user)
+    db_session.commit()
+    task = Task(title="Métrica", owner_id=user.id)
+    db_session.add(task)
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+
+    # Act (Ação)
+    client.put(f"/tasks/{task.id}", json={"title": "Editada"}, headers=headers)
+    client.put("/tasks/999999", json={"title": "Nada"}, headers=headers)
+    response = client.get("/metrics")
+
+    # Assert (Verificação)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    lines = response.text.splitlines()
+    route = 'method="PUT",route="/tasks/{task_id}"'
+    assert any(
+        line.startswith(f'http_requests_total{{{route},status="200"}}')
+        for line in lines
+    )
+    assert any(
+        line.startswith(f'http_requests_total{{{route},status="404"}}')
+        for line in lines
+    )
+    assert any(
+        line.startswith(f'http_request_duration_seconds_bucket{{{route},le="+Inf"}}')
+        for line in lines
+    )
+    assert any(line.startswith("password_queue_depth ") for line in lines)
+    assert any(line.startswith('cache_hits_total{cache="user"}') for line in lines)
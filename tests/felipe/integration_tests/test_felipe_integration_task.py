@@ -0,0 +1,418 @@
+# tests/felipe/integration_tests/test_felipe_integration_task.py
+
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from auth import create_access_token
+from database import Task, User, task_shares
+from routers.task import find_duplicate_titles, task_list_cache
+from settings import settings
+
+
+def test_create_task_duplicate_title_endpoint(client: TestClient, db_session: Session):
+    """
+    CT005: Cadastro de tarefa com título duplicado via endpoint
+    Entradas:
+        Título: "Pagar contas" (já cadastrado pelo mesmo usuário)
+    Resultado Esperado:
+        O sistema responde com erro (código 400) informando que o título já existe.
+        Apenas uma tarefa com o título permanece no banco de dados.
+    Prioridade:
+        Alta
+    """
+    # Arrange (Preparação)
+    user = User(name="Lucas Rocha", email="lucas.rocha@exemplo.com", password="hash")
+    db_session.add(user)
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+    task_data = {"title": "Pagar contas", "description": "Luz e água"}
+
+    # Act (Ação)
+    first_response = client.post("/tasks/", json=task_data, headers=headers)
+    second_response = client.post("/tasks/", json=task_data, headers=headers)
+
+    # Assert (Verificação)
+    assert first_response.status_code == 201
+    assert second_response.status_code == 400
+    assert (
+        second_response.json()["detail"] == "Você já possui uma tarefa com este título"
+    )
+    assert db_session.query(Task).filter_by(title=task_data["title"]).count() == 1
+
+
+def test_create_task_same_title_other_user_endpoint(
+    client: TestClient, db_session: Session
+):
+    """
+    CT006: Cadastro de tarefas com o mesmo título por usuários diferentes
+    Entradas:
+        Título: "Estudar" cadastrado por dois usuários distintos
+    Resultado Esperado:
+        O sistema aceita as duas tarefas (código 201), pois a unicidade é por usuário.
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    users = [
+        User(name="Bruna Alves", email="bruna.alves@exemplo.com", password="hash"),
+        User(name="Caio Dias", email="caio.dias@exemplo.com", password="hash"),
+    ]
+    db_session.add_all(users)
+    db_session.commit()
+
+    # Act (Ação)
+    responses = [
+        client.post(
+            "/tasks/",
+            json={"title": "Estudar"},
+            headers={
+                "Authorization": f"Bearer {create_access_token({'sub': user.email})}"
+            },
+        )
+        for user in users
+    ]
+
+    # Assert (Verificação)
+    assert [response.status_code for response in responses] == [201, 201]
+    assert db_session.query(Task).filter_by(title="Estudar").count() == 2
+
+
+def test_create_tasks_batch_endpoint(client: TestClient, db_session: Session):
+    """
+    CT007: Cadastro de tarefas em lote via endpoint
+    Entradas:
+        Tarefa existente: "Academia"
+        Lote: "Academia", "Mercado", "Farmácia", "Mercado"
+    Resultado Esperado:
+        O sistema responde com um resultado por item, na ordem enviada.
+        "Mercado" e "Farmácia" são criadas (201); o título já existente e a
+        repetição dentro do lote são rejeitados (400).
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    user = User(name="Diego Reis", email="diego.reis@exemplo.com", password="hash")
+    db_session.add(user)
+    db_session.commit()
+    db_session.add(Task(title="Academia", owner_id=user.id))
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+    batch = {
+        "tasks": [
+            {"title": "Academia"},
+            {"title": "Mercado", "description": "Frutas"},
+            {"title": "Farmácia"},
+            {"title": "Mercado"},
+        ]
+    }
+
+    # Act (Ação)
+    response = client.post("/tasks/batch", json=batch, headers=headers)
+
+    # Assert (Verificação)
+    assert response.status_code == 200
+    results = response.json()
+    assert [result["index"] for result in results] == [0, 1, 2, 3]
+    assert [result["status_code"] for result in results] == [400, 201, 201, 400]
+    assert results[0]["detail"] == "Você já possui uma tarefa com este título"
+    assert results[1]["task"]["title"] == "Mercado"
+    assert results[1]["task"]["description"] == "Frutas"
+    assert results[1]["task"]["is_completed"] is False
+    assert db_session.query(Task).filter_by(owner_id=user.id).count() == 3
+
+
+def test_delete_tasks_batch_endpoint(client: TestClient, db_session: Session):
+    """
+    CT008: Exclusão de tarefas em lote via endpoint
+    Entradas:
+        IDs: tarefa pendente compartilhada e tarefa concluída
+    Resultado Esperado:
+        A tarefa pendente e seus compartilhamentos são excluídos (200).
+        A tarefa concluída é rejeitada (400) e permanece no banco.
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    owner = User(name="Elisa Prado", email="elisa.prado@exemplo.com", password="hash")
+    friend = User(name="Fábio Cruz", email="fabio.cruz@exemplo.com", password="hash")
+    db_session.add_all([owner, friend])
+    db_session.commit()
+    pending = Task(title="Pendente", owner_id=owner.id, shared_with_users=[friend])
+    completed = Task(title="Concluída", is_completed=True, owner_id=owner.id)
+    db_session.add_all([pending, completed])
+    db_session.commit()
+    pending_id, completed_id = pending.id, completed.id
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': owner.email})}"}
+
+    # Act (Ação)
+    response = client.post(
+        "/tasks/batch/delete", json={"ids": [pending_id, completed_id]}, headers=headers
+    )
+
+    # Assert (Verificação)
+    assert response.status_code == 200
+    assert response.json() == [
+        {"id": pending_id, "status_code": 200, "detail": None},
+        {
+            "id": completed_id,
+            "status_code": 400,
+            "detail": "Tarefas concluídas não podem ser excluídas",
+        },
+    ]
+    db_session.expire_all()
+    assert db_session.get(Task, pending_id) is None
+    assert db_session.get(Task, completed_id) is not None
+    assert db_session.query(task_shares).filter_by(task_id=pending_id).count() == 0
+
+
+def test_import_tasks_ndjson_endpoint(
+    client: TestClient, db_session: Session, mocker_fixture
+):
+    """
+    CT009: Importação de tarefas a partir de arquivo NDJSON
+    Entradas:
+        Tarefa existente: "Relatório"
+        Arquivo com 5 linhas: duas válidas, uma com título já existente,
+        uma com título vazio e uma com JSON inválido.
+        Tamanho do bloco de confirmação: 2
+    Resultado Esperado:
+        As tarefas válidas são criadas e cada linha rejeitada é informada
+        com seu número e o motivo.
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    mocker_fixture.patch("routers.task.IMPORT_CHUNK_SIZE", new=2)
+    user = User(name="Gabi Lopes", email="gabi.lopes@exemplo.com", password="hash")
+    db_session.add(user)
+    db_session.commit()
+    db_session.add(Task(title="Relatório", owner_id=user.id))
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+    content = "\n".join(
+        [
+            '{"title": "Backup", "description": "Semanal"}',
+            '{"title": "Relatório"}',
+            '{"title": ""}',
+            "{nao e json",
+            '{"title": "Deploy"}',
+        ]
+    )
+
+    # Act (Ação)
+    response = client.post(
+        "/tasks/import",
+        files={"file": ("tarefas.ndjson", content, "application/x-ndjson")},
+        headers=headers,
+    )
+
+    # Assert (Verificação)
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["processed"], result["created"], result["failed"]) == (5, 2, 3)
+    assert [error["line"] for error in result["errors"]] == [2, 3, 4]
+    assert result["errors"][0]["detail"] == "Você já possui uma tarefa com este título"
+    assert result["errors"][1]["detail"].startswith("title:")
+    assert result["errors"][2]["detail"] == "JSON inválido"
+    titles = {task.title for task in db_session.query(Task).filter_by(owner_id=user.id)}
+    assert titles == {"Relatório", "Backup", "Deploy"}
+
+
+def test_import_tasks_csv_endpoint(client: TestClient, db_session: Session):
+    """
+    CT010: Importação de tarefas a partir de arquivo CSV
+    Entradas:
+        Arquivo CSV com cabeçalho "title,description" e duas tarefas,
+        a segunda sem descrição.
+    Resultado Esperado:
+        As duas tarefas são criadas; a descrição vazia é armazenada como nula.
+    Prioridade:
+        Baixa
+    """
+    # Arrange (Preparação)
+    user = User(name="Hugo Melo", email="hugo.melo@exemplo.com", password="hash")
+    db_session.add(user)
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+    content = "title,description\nLavar carro,Sábado\nPagar boleto,\n"
+
+    # Act (Ação)
+    response = client.post(
+        "/tasks/import",
+        params={"format": "csv"},
+        files={"file": ("tarefas.csv", content, "text/csv")},
+        headers=headers,
+    )
+
+    # Assert (Verificação)
+    assert response.status_code == 200
+    assert response.json() == {"processed": 2, "created": 2, "failed": 0, "errors": []}
+    task = db_session.query(Task).filter_by(title="Pagar boleto").one()
+    assert task.description is None
+
+
+def test_list_tasks_serialization_modes_match(
+    client: TestClient, db_session: Session, mocker_fixture
+):
+    """
+    CT011: Listagem idêntica nos modos de serialização "orm" e "rows"
+    Entradas:
+        Tarefa pendente com descrição acentuada e tarefa concluída sem descrição,
+        listadas com e sem paginação.
+    Resultado Esperado:
+        Os corpos e o cabeçalho X-Next-Cursor são iguais byte a byte nos dois modos.
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    user = User(name="Íris Nunes", email="iris.nunes@exemplo.com", password="hash")
+    db_session.add(user)
+    db_session.commit()
+    db_session.add_all(
+        [
+            Task(title="Reunião", description="Café às 9h", owner_id=user.id),
+            Task(
+                title="Relatório",
+                is_completed=True,
+                completion_date=datetime(2024, 5, 6, 7, 8, 9, 123456),
+                owner_id=user.id,
+            ),
+        ]
+    )
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+
+    # Act (Ação)
+    responses = {}
+    for mode in ("orm", "rows"):
+        mocker_fixture.patch_object(settings, "task_serialization", new=mode)
+        task_list_cache.clear()
+        responses[mode] = [
+            client.get("/tasks/", headers=headers),
+            client.get("/tasks/", params={"limit": 1}, headers=headers),
+        ]
+
+    # Assert (Verificação)
+    for orm_response, rows_response in zip(responses["orm"], responses["rows"]):
+        assert orm_response.status_code == rows_response.status_code == 200
+        assert orm_response.content == rows_response.content
+        assert orm_response.headers.get("X-Next-Cursor") == rows_response.headers.get(
+            "X-Next-Cursor"
+        )
+    assert (
+        responses["rows"][0].json()[1]["completion_date"]
+        == "2024-05-06T07:08:09.123456"
+    )
+    assert "X-Next-Cursor" in responses["rows"][1].headers
+
+
+def test_create_tasks_batch_concurrent_duplicate(
+    client: TestClient, db_session: Session, mocker_fixture
+):
+    """
+    CT023: Cadastro em lote com título criado por outra requisição
+    Entradas:
+        Lote com o título "Relatório", já existente, que a verificação
+        prévia não encontra (como quando outra requisição o cria entre a
+        verificação e o INSERT).
+    Resultado Esperado:
+        O lote é rejeitado com erro 400 de título duplicado, sem erro interno,
+        e nenhuma tarefa do lote é criada.
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    mocker_fixture.patch(
+        "routers.task.find_duplicate_titles",
+        side_effect=lambda db, owner_id, tasks: [False] * len(tasks),
+    )
+    user = User(name="Ivo Dias", email="ivo.dias@exemplo.com", password="hash")
+    db_session.add(user)
+    db_session.commit()
+    db_session.add(Task(title="Relatório", owner_id=user.id))
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+
+    # Act (Ação)
+    response = client.post(
+        "/tasks/batch",
+        json={"tasks": [{"title": "Backup"}, {"title": "Relatório"}]},
+        headers=headers,
+    )
+
+    # Assert (Verificação)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Você já possui uma tarefa com este título"
+    titles = [task.title for task in db_session.query(Task).filter_by(owner_id=user.id)]
+    assert titles == ["Relatório"]
+
+
+def test_import_tasks_concurrent_duplicate(
+    client: TestClient, db_session: Session, mocker_fixture
+):
+    """
+    CT024: Importação com título criado por outra requisição
+    Entradas:
+        Arquivo com blocos de 2 linhas. A verificação prévia do segundo bloco
+        não encontra o título "Relatório", já existente; em outro cenário,
+        nenhuma verificação o encontra.
+    Resultado Esperado:
+        A importação não é interrompida: o bloco em conflito é desfeito e
+        verificado de novo, rejeitando apenas a linha duplicada. Se o conflito
+        persistir, as linhas do bloco são registradas como erros e os demais
+        blocos continuam importados.
+    Prioridade:
+        Média
+    """
+    # Arrange (Preparação)
+    mocker_fixture.patch("routers.task.IMPORT_CHUNK_SIZE", new=2)
+    user = User(name="Jade Reis", email="jade.reis@exemplo.com", password="hash")
+    db_session.add(user)
+    db_session.commit()
+    db_session.add(Task(title="Relatório", owner_id=user.id))
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+
+    def import_file(titles: list):
+        content = "\n".join(f'{{"title": "{title}"}}' for title in titles)
+        return client.post(
+            "/tasks/import",
+            files={"file": ("tarefas.ndjson", content, "application/x-ndjson")},
+            headers=headers,
+        ).json()
+
+    def missing_first_check():
+        calls = []
+
+        def check(db, owner_id, tasks):
+            calls.append(tasks)
+            if len(calls) == 2:
+                return [False] * len(tasks)
+            return find_duplicate_titles(db, owner_id, tasks)
+
+        return check
+
+    # Act (Ação)
+    mocker_fixture.patch(
+        "routers.task.find_duplicate_titles", side_effect=missing_first_check()
+    )
+    retried = import_file(["Backup", "Deploy", "Relatório", "Compras"])
+
+    mocker_fixture.patch(
+        "routers.task.find_duplicate_titles",
+        side_effect=lambda db, owner_id, tasks: [False] * len(tasks),
+    )
+    persistent = import_file(["Agenda", "Relatório", "Viagem"])
+
+    # Assert (Verificação)
+    assert (retried["created"], retried["failed"]) == (3, 1)
+    assert retried["errors"] == [
+        {"line": 3, "detail": "Você já possui uma tarefa com este título"}
+    ]
+    assert (persistent["created"], persistent["failed"]) == (1, 2)
+    assert [error["line"] for error in persistent["errors"]] == [1, 2]
+    assert persistent["errors"][0]["detail"].startswith("Bloco não importado")
+    titles = {task.title for task in db_session.query(Task).filter_by(owner_id=user.id)}
+    assert titles == {"Relatório", "Backup", "Deploy", "Compras", "Viagem"}
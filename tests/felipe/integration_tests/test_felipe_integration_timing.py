@@ -0,0 +1,62 @@
+# tests/felipe/integration_tests/test_felipe_integration_timing.py
+
+import json
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from auth import create_access_token
+from database import Task, User, get_db
+from routers import task
+from timing import RequestTimingMiddleware, instrument_engine, uninstrument_engine
+
+
+def test_request_timing_header_and_log(engine, db_session: Session, caplog):
+    """
+    CT012: Medição por requisição com o cabeçalho Server-Timing
+    Entradas:
+        Listagem de tarefas com a medição ativada.
+    Resultado Esperado:
+        A resposta traz o cabeçalho Server-Timing com as fases da requisição
+        (JWT, usuário, serialização), o tempo e a quantidade de consultas SQL
+        e o total. Uma linha de log em JSON registra os mesmos dados.
+    Prioridade:
+        Baixa
+    """
+    # Arrange (Preparação)
+    user = User(name="Joana Faria", email="joana.faria@exemplo.com", password="hash")
+    db_session.add(user)
+    db_session.commit()
+    db_session.add(Task(title="Medir", owner_id=user.id))
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+
+    app = FastAPI()
+    app.add_middleware(RequestTimingMiddleware)
+    app.include_router(task.router)
+    app.dependency_overrides[get_db] = lambda: db_session
+    instrument_engine(engine)
+
+    # Act (Ação)
+    try:
+        with caplog.at_level(logging.INFO, logger="timing"):
+            response = TestClient(app).get("/tasks/", headers=headers)
+    finally:
+        uninstrument_engine(engine)
+
+    # Assert (Verificação)
+    assert response.status_code == 200
+    metrics = {
+        metric.split(";")[0]: metric
+        for metric in response.headers["Server-Timing"].split(", ")
+    }
+    assert {"jwt", "user", "serialize", "db", "total"} <= set(metrics)
+    log = json.loads(caplog.records[-1].getMessage())
+    assert log["method"] == "GET"
+    assert log["path"] == "/tasks/"
+    assert log["status"] == 200
+    assert log["sql_count"] >= 2
+    assert metrics["db"].endswith(f'desc="{log["sql_count"]} queries"')
+    assert set(log["phases_ms"]) == {"jwt", "user", "serialize"}
@@ -1,6 +1,14 @@
 # test_auth.py
 
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.util import greenlet_spawn
+
 from auth import get_password_hash, verify_password
+from passwords import PasswordExecutor, check_password, hash_password
 
 
 def test_get_password_hash_valid_password():
@@ -86,3 +94,78 @@ def test_verify_password_incorrect():
 
     # Assert (Verificação)
     assert result is False
+
+
+def test_password_hash_in_process_pool():
+    """
+    CT007: Garantir geração e verificação de hash no pool de processos
+    Entradas:
+        Senha: "senha_segura123"
+        Pool com 1 processo
+    Resultado Esperado:
+        O hash gerado no pool é verificado com sucesso e a fila é esvaziada
+    Pós-condições:
+        O pool é encerrado
+    """
+    # Arrange (Preparação)
+    executor = PasswordExecutor(workers=1, max_pending=4)
+
+    # Act (Ação)
+    try:
+        hashed_password = executor.run(hash_password, "senha_segura123")
+        result = executor.run(check_password, "senha_segura123", hashed_password)
+    finally:
+        executor.shutdown()
+
+    # Assert (Verificação)
+    assert result is True
+    assert executor.queue_depth == 0
+
+
+def test_password_pool_saturated(mocker_fixture):
+    """
+    CT008: Garantir erro 503 quando o pool de senhas está saturado
+    Entradas:
+        Senha: "senha_segura123"
+        Pool sem vagas para novos trabalhos
+    Resultado Esperado:
+        A função retorna erro 503 pedindo para tentar novamente
+    Pós-condições:
+        Nenhum processo é criado
+    """
+    # Arrange (Preparação)
+    mocker_fixture.patch(
+        "auth.password_executor", new=PasswordExecutor(workers=1, max_pending=0)
+    )
+
+    # Act (Ação)
+    with pytest.raises(HTTPException) as exc_info:
+        get_password_hash("senha_segura123")
+
+    # Assert (Verificação)
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers == {"Retry-After": "1"}
+
+
+def test_password_work_off_event_loop_without_pool():
+    """
+    CT021: Garantir que o bcrypt não bloqueia o event loop no modo assíncrono
+    Entradas:
+        Pool sem processos (workers=0), chamado dentro de um greenlet do
+        SQLAlchemy, como em AsyncSession.run_sync
+    Resultado Esperado:
+        O trabalho é executado em outra thread, e não na do event loop
+    """
+    # Arrange (Preparação)
+    executor = PasswordExecutor(workers=0, max_pending=4)
+
+    async def run_in_greenlet():
+        return threading.get_ident(), await greenlet_spawn(
+            executor.run, threading.get_ident
+        )
+
+    # Act (Ação)
+    loop_thread, work_thread = asyncio.run(run_in_greenlet())
+
+    # Assert (Verificação)
+    assert work_thread != loop_thread
@@ -0,0 +1,142 @@
+# test_cache.py
+
+import pytest
+
+from cache import MemoryResponseCache, SQLiteResponseCache, TTLCache
+
+
+class FakeTimer:
+    """Relógio controlado manualmente pelos testes."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_counts_hits_and_misses():
+    """
+    CT011: Garantir contagem de acertos e falhas do cache
+    Entradas:
+        Chave "token" armazenada e chave "outro" ausente
+    Resultado Esperado:
+        A leitura de "token" conta um acerto e a de "outro" conta uma falha
+    """
+    # Arrange (Preparação)
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("token", {"id": 1})
+
+    # Act (Ação)
+    hit = cache.get("token")
+    miss = cache.get("outro")
+
+    # Assert (Verificação)
+    assert hit == {"id": 1}
+    assert miss is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1, "maxsize": 10}
+
+
+def test_cache_expires_entries_after_ttl():
+    """
+    CT012: Garantir expiração das entradas do cache
+    Entradas:
+        TTL do cache: 60 segundos; TTL da entrada: 5 segundos
+    Resultado Esperado:
+        A entrada é retornada antes de 5 segundos e descartada depois
+    """
+    # Arrange (Preparação)
+    timer = FakeTimer()
+    cache = TTLCache(maxsize=10, ttl=60, timer=timer)
+    cache.set("token", "usuario", ttl=5)
+
+    # Act (Ação)
+    timer.now = 4
+    before_expiration = cache.get("token")
+    timer.now = 6
+    after_expiration = cache.get("token")
+
+    # Assert (Verificação)
+    assert before_expiration == "usuario"
+    assert after_expiration is None
+    assert cache.stats()["size"] == 0
+
+
+def test_cache_evicts_least_recently_used():
+    """
+    CT013: Garantir descarte da entrada usada há mais tempo (LRU)
+    Entradas:
+        Cache com capacidade 2; chaves "a", "b" e "c"
+    Resultado Esperado:
+        Após ler "a" e inserir "c", a chave "b" é descartada
+    """
+    # Arrange (Preparação)
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    # Act (Ação)
+    cache.get("a")
+    cache.set("c", 3)
+
+    # Assert (Verificação)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_response_cache_keys_entries_by_scope_version(backend, tmp_path):
+    """
+    CT014: Garantir que o cache de respostas separa as entradas por versão
+    Entradas:
+        Respostas armazenadas para os escopos 1 e 2 na versão 0; leitura do
+        escopo 1 na versão 1
+    Resultado Esperado:
+        A resposta gravada na versão 0 do escopo 1 não é servida na versão 1.
+        O escopo 2 não é afetado.
+    """
+    # Arrange (Preparação)
+    if backend == "memory":
+        cache = MemoryResponseCache(maxsize=10, ttl=60)
+    else:
+        cache = SQLiteResponseCache(path=str(tmp_path / "cache.db"), maxsize=10, ttl=60)
+    cache.set(1, 0, "lista", {"body": "[]"})
+    cache.set(2, 0, "lista", {"body": "[1]"})
+
+    # Act (Ação)
+    current = cache.get(1, 1, "lista")
+
+    # Assert (Verificação)
+    assert current is None
+    assert cache.get(1, 0, "lista") == {"body": "[]"}
+    assert cache.get(2, 0, "lista") == {"body": "[1]"}
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_response_cache_limits_stored_bytes(backend, tmp_path):
+    """
+    CT025: Garantir o limite de bytes do cache de respostas
+    Entradas:
+        Limite de 100 bytes; três respostas de 45 bytes e uma de 200 bytes
+    Resultado Esperado:
+        A resposta mais antiga é descartada para respeitar o limite, a mais
+        recente é mantida e a maior que o limite não é armazenada
+    """
+    # Arrange (Preparação)
+    if backend == "memory":
+        cache = MemoryResponseCache(maxsize=10, ttl=60, maxbytes=100)
+    else:
+        cache = SQLiteResponseCache(
+            path=str(tmp_path / "cache.db"), maxsize=10, ttl=60, maxbytes=100
+        )
+
+    # Act (Ação)
+    for key in ("a", "b", "c"):
+        cache.set(1, 0, key, {"body": key * 45})
+    cache.set(1, 0, "grande", {"body": "x" * 200})
+
+    # Assert (Verificação)
+    assert cache.get(1, 0, "a") is None
+    assert cache.get(1, 0, "c") == {"body": "c" * 45}
+    assert cache.get(1, 0, "grande") is None
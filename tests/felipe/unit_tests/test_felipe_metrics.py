@@ -0,0 +1,86 @@
+# test_metrics.py
+
+import json
+import os
+import threading
+
+from metrics import MetricsRegistry
+
+
+def test_metrics_registry_sums_threads_and_renders_histogram():
+    """
+    CT015: Garantir a soma das métricas de várias threads e o histograma
+    Entradas:
+        4 threads incrementando o mesmo contador 1000 vezes cada
+        Latências observadas: 0,004 s e 0,3 s
+    Resultado Esperado:
+        O contador exposto é 4000 e os buckets do histograma são cumulativos
+    """
+    # Arrange (Preparação)
+    registry = MetricsRegistry()
+    labels = (("method", "GET"), ("route", "/tasks/"), ("status", "200"))
+
+    def work():
+        for _ in range(1000):
+            registry.inc("http_requests_total", labels)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+
+    # Act (Ação)
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    route = labels[:2]
+    registry.observe("http_request_duration_seconds", route, 0.004)
+    registry.observe("http_request_duration_seconds", route, 0.3)
+    output = registry.render()
+
+    # Assert (Verificação)
+    assert (
+        'http_requests_total{method="GET",route="/tasks/",status="200"} 4000' in output
+    )
+    bucket = (
+        'http_request_duration_seconds_bucket{method="GET",route="/tasks/",le="%s"}'
+    )
+    assert f"{bucket % '0.0025'} 0" in output
+    assert f"{bucket % '0.005'} 1" in output
+    assert f"{bucket % '0.25'} 1" in output
+    assert f"{bucket % '0.5'} 2" in output
+    assert f"{bucket % '+Inf'} 2" in output
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/tasks/"} 2' in output
+    )
+
+
+def test_metrics_registry_aggregates_workers(tmp_path):
+    """
+    CT016: Garantir a agregação das métricas de vários workers
+    Entradas:
+        Arquivos de amostras de um worker ativo e de um worker encerrado
+    Resultado Esperado:
+        Os contadores de todos os workers são somados; os gauges do worker
+        encerrado são descartados
+    """
+    # Arrange (Preparação)
+    registry = MetricsRegistry(directory=str(tmp_path))
+    registry.inc("db_pool_checkouts_total", amount=5)
+    registry.inc("http_requests_in_flight", amount=1)
+    live_pid = os.getppid()
+    dead_pid = 2**22 + 1  # acima do maior PID do Linux
+    for pid in (live_pid, dead_pid):
+        (tmp_path / f"metrics-{pid}.json").write_text(
+            json.dumps(
+                [
+                    ["db_pool_checkouts_total", [], 10],
+                    ["http_requests_in_flight", [], 3],
+                ]
+            )
+        )
+
+    # Act (Ação)
+    output = registry.render()
+
+    # Assert (Verificação)
+    assert "db_pool_checkouts_total 25" in output
+    assert "http_requests_in_flight 4" in output
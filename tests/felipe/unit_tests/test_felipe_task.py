@@ -4,6 +4,7 @@ from unittest.mock import Mock
 
 import pytest
 from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from database import Task, User
@@ -66,19 +67,13 @@ def test_create_task_duplicate_title():
     mock_db = Mock(spec=Session)
     mock_current_user = User(id=1, email="user@example.com")
 
-    # Simula uma tarefa existente com o mesmo título
-    existing_task = Task(
-        id=1,
-        title="Comprar leite",
-        description="Tarefa existente",
-        owner_id=mock_current_user.id,
+    # Simula a violação do índice único (owner_id, title) ao confirmar a transação
+    mock_db.commit.side_effect = IntegrityError(
+        "INSERT INTO tasks",
+        {},
+        Exception("UNIQUE constraint failed: tasks.owner_id, tasks.title"),
     )
 
-    # Mock para retornar a tarefa existente ao filtrar por título
-    mock_query = mock_db.query.return_value
-    mock_filter = mock_query.filter.return_value
-    mock_filter.first.return_value = existing_task  # Tarefa existente encontrada
-
     # Dados da nova tarefa que tenta usar um título duplicado
     task_data = TaskCreate(
         title="Comprar leite",
@@ -90,6 +85,7 @@ def test_create_task_duplicate_title():
         create_task(task=task_data, current_user=mock_current_user, db=mock_db)
     assert exc_info.value.status_code == 400
     assert exc_info.value.detail == "Você já possui uma tarefa com este título"
+    mock_db.rollback.assert_called_once()
 
 
 def test_delete_existing_task():